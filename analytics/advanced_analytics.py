@@ -257,6 +257,44 @@ class AdvancedAnalytics:
             self.logger.error(f"Error calculating client risk profiles: {e}")
             return []
     
+    def get_risk_summary(self) -> Dict:
+        """
+        Aggregate the cheque totals shown on the risk cards in SQL
+        """
+        try:
+            with sqlite3.connect(self.db.db_path) as conn:
+                cursor = conn.cursor()
+                
+                # Same scope as the risk profiles: cheques of active clients
+                cursor.execute("""
+                    SELECT 
+                        COUNT(c.id),
+                        COALESCE(SUM(CASE WHEN c.status IN ('rejete', 'impaye') THEN 1 ELSE 0 END), 0)
+                    FROM cheques c
+                    JOIN clients cl ON cl.id = c.client_id
+                    WHERE cl.active = TRUE
+                """)
+                total_cheques, bounced_cheques = cursor.fetchone()
+                
+                # Pending cheques past their due date
+                cursor.execute("""
+                    SELECT COALESCE(SUM(amount), 0)
+                    FROM cheques
+                    WHERE status = 'en_attente' AND due_date < date('now', 'localtime')
+                """)
+                overdue_amount = cursor.fetchone()[0]
+                
+                return {
+                    'total_cheques': total_cheques,
+                    'bounced_cheques': bounced_cheques,
+                    'bounce_rate': (bounced_cheques / total_cheques * 100) if total_cheques > 0 else 0,
+                    'overdue_amount': overdue_amount
+                }
+                
+        except Exception as e:
+            self.logger.error(f"Error calculating risk summary: {e}")
+            return {'total_cheques': 0, 'bounced_cheques': 0, 'bounce_rate': 0, 'overdue_amount': 0}
+    
     def _calculate_risk_score(self, bounce_rate: float, total_cheques: int, 
                             total_amount: float, avg_processing_time: float, 
                             last_bounce_date: str, active_months: int) -> float:
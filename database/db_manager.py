@@ -9,6 +9,38 @@ import logging
 from datetime import datetime, date
 from typing import List, Dict, Optional, Any
 from pathlib import Path
+from contextlib import contextmanager
+
+# Repli des accents du français ("déposé" trouve "depose")
+_ACCENT_TABLE = str.maketrans('àáâãäåèéêëìíîïòóôõöùúûüýÿñç',
+                              'aaaaaaeeeeiiiiooooouuuuyync')
+
+
+def normalize_text(text: str) -> str:
+    """Forme insensible à la casse et aux accents d'un texte (fonction SQL normalize_text)"""
+    return text.casefold().translate(_ACCENT_TABLE) if text else ''
+
+
+def _like_contains(term: str) -> str:
+    """Motif LIKE 'contient term', avec % _ et \\ saisis pris littéralement (ESCAPE '\\')"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+class _Transaction:
+    """Écritures partageant la connexion ouverte par DatabaseManager.transaction"""
+    
+    def __init__(self, manager, cursor):
+        self._manager = manager
+        self._cursor = cursor
+    
+    def add_client(self, *args, **kwargs) -> int:
+        """Ajoute un client dans la transaction"""
+        return self._manager._insert_client(self._cursor, *args, **kwargs)
+    
+    def add_cheque(self, cheque_data: Dict) -> int:
+        """Ajoute un chèque dans la transaction"""
+        return self._manager._insert_cheque(self._cursor, cheque_data)
+
 
 class DatabaseManager:
     """Gestionnaire principal de la base de données"""
@@ -18,12 +50,32 @@ class DatabaseManager:
         self.logger = logging.getLogger(__name__)
         self.init_database()
     
+    # Réglages de chaque connexion : moins de fsync (sûr en mode WAL), tables
+    # temporaires en RAM (le mode WAL, persistant, est fixé dans init_database).
+    # Chaque méthode ouvre sa propre connexion pour une requête : un cache de pages
+    # ou un mmap plus grands seraient perdus à sa fermeture.
+    _CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+    )
+    
+    def _connect(self):
+        """Ouvre une connexion configurée avec _CONNECTION_PRAGMAS (et normalize_text)"""
+        conn = sqlite3.connect(self.db_path)
+        conn.create_function("normalize_text", 1, normalize_text, deterministic=True)
+        for pragma in self._CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     def init_database(self):
         """Initialise la base de données avec toutes les tables nécessaires"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
+                # Journal WAL : lectures concurrentes des écritures, moins de fsync
+                cursor.execute("PRAGMA journal_mode = WAL")
+                
                 # Table des banques
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS banks (
@@ -144,6 +196,9 @@ class DatabaseManager:
                     )
                 ''')
                 
+                # Compteur de modifications des chèques et clients (voir get_cheques_signature)
+                self._create_change_counter(cursor)
+                
                 # Création des index pour optimiser les performances
                 self._create_indexes(cursor)
                 
@@ -157,14 +212,41 @@ class DatabaseManager:
             self.logger.error(f"❌ Erreur lors de l'initialisation de la base de données: {e}")
             raise
     
+    def _create_change_counter(self, cursor):
+        """Crée le compteur incrémenté par trigger à chaque écriture sur les chèques et clients"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS change_counter (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                value INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO change_counter (id, value) VALUES (1, 0)")
+        
+        for table in ('cheques', 'clients'):
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_count
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE change_counter SET value = value + 1 WHERE id = 1;
+                    END
+                """)
+    
     def _create_indexes(self, cursor):
         """Crée les index pour optimiser les performances"""
         indexes = [
             "CREATE INDEX IF NOT EXISTS idx_cheques_status ON cheques(status)",
-            "CREATE INDEX IF NOT EXISTS idx_cheques_due_date ON cheques(due_date)",
+            "DROP INDEX IF EXISTS idx_cheques_due_date",
+            "CREATE INDEX IF NOT EXISTS idx_cheques_due_amount ON cheques(due_date, amount)",
             "CREATE INDEX IF NOT EXISTS idx_cheques_client ON cheques(client_id)",
             "CREATE INDEX IF NOT EXISTS idx_cheques_branch ON cheques(branch_id)",
             "CREATE INDEX IF NOT EXISTS idx_cheques_number ON cheques(cheque_number)",
+            "DROP INDEX IF EXISTS idx_cheques_status_due",
+            "CREATE INDEX IF NOT EXISTS idx_cheques_status_due_amount ON cheques(status, due_date, amount)",
+            "CREATE INDEX IF NOT EXISTS idx_cheques_branch_due ON cheques(branch_id, due_date)",
+            "CREATE INDEX IF NOT EXISTS idx_cheques_created ON cheques(created_at DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_cheques_amount ON cheques(amount)",
+            "DROP INDEX IF EXISTS idx_clients_name_nocase",
             "CREATE INDEX IF NOT EXISTS idx_branches_bank ON branches(bank_id)",
             "CREATE INDEX IF NOT EXISTS idx_clients_type ON clients(type)",
             "CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(user_id)",
@@ -173,6 +255,25 @@ class DatabaseManager:
         
         for index_sql in indexes:
             cursor.execute(index_sql)
+        
+        # Statistiques pour le planificateur : toute la base à la première ouverture,
+        # puis les index ajoutés par une mise à jour (encore sans statistiques)
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        )
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("ANALYZE")
+        else:
+            cursor.execute("""
+                SELECT name FROM sqlite_master
+                WHERE type = 'index' AND name LIKE 'idx_%'
+                  AND name NOT IN (SELECT idx FROM sqlite_stat1 WHERE idx IS NOT NULL)
+            """)
+            for (index_name,) in cursor.fetchall():
+                cursor.execute(f'ANALYZE "{index_name}"')
+        
+        # Rafraîchit les statistiques devenues obsolètes (toutes les tables, SQLite ≥ 3.46)
+        cursor.execute("PRAGMA optimize = 0x10002")
     
     def _insert_default_data(self, cursor):
         """Insert les données par défaut"""
@@ -218,11 +319,19 @@ class DatabaseManager:
                 (key, value, description)
             )
     
+    # === TRANSACTIONS ===
+    
+    @contextmanager
+    def transaction(self):
+        """Regroupe plusieurs écritures dans une seule transaction (un seul commit)"""
+        with self._connect() as conn:
+            yield _Transaction(self, conn.cursor())
+    
     # === MÉTHODES POUR LES BANQUES ===
     
     def get_banks(self, active_only: bool = True) -> List[Dict]:
         """Récupère la liste des banques"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM banks"
             if active_only:
@@ -235,7 +344,7 @@ class DatabaseManager:
     
     def add_bank(self, name: str, code: str = None) -> int:
         """Ajoute une nouvelle banque"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO banks (name, code) VALUES (?, ?)",
@@ -245,7 +354,7 @@ class DatabaseManager:
     
     def update_bank(self, bank_id: int, name: str, code: str = None) -> bool:
         """Met à jour une banque"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "UPDATE banks SET name = ?, code = ? WHERE id = ?",
@@ -255,7 +364,7 @@ class DatabaseManager:
     
     def delete_bank(self, bank_id: int) -> bool:
         """Supprime une banque (soft delete)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "UPDATE banks SET active = FALSE WHERE id = ?",
@@ -267,7 +376,7 @@ class DatabaseManager:
     
     def get_branches(self, bank_id: int = None, active_only: bool = True) -> List[Dict]:
         """Récupère la liste des agences"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             query = """
                 SELECT b.*, bk.name as bank_name 
@@ -295,7 +404,7 @@ class DatabaseManager:
     def add_branch(self, bank_id: int, name: str, address: str = None, 
                    postal_code: str = None, phone: str = None, email: str = None) -> int:
         """Ajoute une nouvelle agence"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """INSERT INTO branches (bank_id, name, address, postal_code, phone, email) 
@@ -308,7 +417,7 @@ class DatabaseManager:
     
     def get_clients(self, client_type: str = None, active_only: bool = True) -> List[Dict]:
         """Récupère la liste des clients"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM clients"
             params = []
@@ -333,24 +442,30 @@ class DatabaseManager:
                    vat_number: str = None, address: str = None, 
                    phone: str = None, email: str = None) -> int:
         """Ajoute un nouveau client"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """INSERT INTO clients (type, name, id_number, vat_number, address, phone, email) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (client_type, name, id_number, vat_number, address, phone, email)
-            )
-            return cursor.lastrowid
+        with self._connect() as conn:
+            return self._insert_client(conn.cursor(), client_type, name, id_number,
+                                       vat_number, address, phone, email)
+    
+    def _insert_client(self, cursor, client_type: str, name: str, id_number: str = None,
+                       vat_number: str = None, address: str = None,
+                       phone: str = None, email: str = None) -> int:
+        """Insère un client avec le curseur fourni"""
+        cursor.execute(
+            """INSERT INTO clients (type, name, id_number, vat_number, address, phone, email) 
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (client_type, name, id_number, vat_number, address, phone, email)
+        )
+        return cursor.lastrowid
     
-    def search_clients(self, search_term: str) -> List[Dict]:
+    def search_clients(self, search_term: str, limit: int = 10) -> List[Dict]:
         """Recherche des clients par nom"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """SELECT * FROM clients 
                    WHERE active = TRUE AND (name LIKE ? OR id_number LIKE ?) 
-                   ORDER BY name LIMIT 10""",
-                (f"%{search_term}%", f"%{search_term}%")
+                   ORDER BY name LIMIT ?""",
+                (f"%{search_term}%", f"%{search_term}%", limit)
             )
             columns = [desc[0] for desc in cursor.description]
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -359,95 +474,155 @@ class DatabaseManager:
     
     def add_cheque(self, cheque_data: Dict) -> int:
         """Ajoute un nouveau chèque"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """INSERT INTO cheques (
-                    amount, currency, issue_date, due_date, client_id, branch_id,
-                    status, cheque_number, depositor_name, invoice_number, 
-                    invoice_date, notes, created_by
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    cheque_data['amount'],
-                    cheque_data.get('currency', 'MAD'),
-                    cheque_data['issue_date'],
-                    cheque_data['due_date'],
-                    cheque_data.get('client_id'),
-                    cheque_data['branch_id'],
-                    cheque_data.get('status', 'en_attente'),
-                    cheque_data['cheque_number'],
-                    cheque_data.get('depositor_name'),
-                    cheque_data.get('invoice_number'),
-                    cheque_data.get('invoice_date'),
-                    cheque_data.get('notes'),
-                    cheque_data.get('created_by')
-                )
+        with self._connect() as conn:
+            return self._insert_cheque(conn.cursor(), cheque_data)
+    
+    def _insert_cheque(self, cursor, cheque_data: Dict) -> int:
+        """Insère un chèque avec le curseur fourni"""
+        cursor.execute(
+            """INSERT INTO cheques (
+                amount, currency, issue_date, due_date, client_id, branch_id,
+                status, cheque_number, depositor_name, invoice_number, 
+                invoice_date, notes, created_by
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                cheque_data['amount'],
+                cheque_data.get('currency', 'MAD'),
+                cheque_data['issue_date'],
+                cheque_data['due_date'],
+                cheque_data.get('client_id'),
+                cheque_data['branch_id'],
+                cheque_data.get('status', 'en_attente'),
+                cheque_data['cheque_number'],
+                cheque_data.get('depositor_name'),
+                cheque_data.get('invoice_number'),
+                cheque_data.get('invoice_date'),
+                cheque_data.get('notes'),
+                cheque_data.get('created_by')
             )
-            return cursor.lastrowid
+        )
+        return cursor.lastrowid
     
-    def get_cheques(self, filters: Dict = None) -> List[Dict]:
-        """Récupère les chèques avec filtres optionnels"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT c.*, 
-                       cl.name as client_name, cl.type as client_type,
-                       b.name as branch_name, bk.name as bank_name
+    # Jointures communes aux requêtes de liste et de synthèse des chèques
+    _CHEQUE_JOINS = """
                 FROM cheques c
                 LEFT JOIN clients cl ON c.client_id = cl.id
                 LEFT JOIN branches b ON c.branch_id = b.id
                 LEFT JOIN banks bk ON b.bank_id = bk.id
             """
+    
+    def _cheque_filter_clause(self, filters: Dict = None):
+        """Construit la clause WHERE (et ses paramètres) des filtres de chèques"""
+        params = []
+        conditions = []
+        
+        if filters:
+            if 'status' in filters:
+                conditions.append("c.status = ?")
+                params.append(filters['status'])
+            
+            if 'bank_id' in filters:
+                # Sous-requête plutôt que bk.id : permet d'utiliser idx_cheques_branch_due
+                conditions.append("c.branch_id IN (SELECT id FROM branches WHERE bank_id = ?)")
+                params.append(filters['bank_id'])
+            
+            if 'branch_id' in filters:
+                conditions.append("c.branch_id = ?")
+                params.append(filters['branch_id'])
+            
+            if 'client_id' in filters:
+                conditions.append("c.client_id = ?")
+                params.append(filters['client_id'])
+            
+            if 'date_from' in filters:
+                conditions.append("c.due_date >= ?")
+                params.append(filters['date_from'])
+            
+            if 'date_to' in filters:
+                conditions.append("c.due_date <= ?")
+                params.append(filters['date_to'])
+            
+            if 'amount_min' in filters:
+                conditions.append("c.amount >= ?")
+                params.append(filters['amount_min'])
+            
+            if 'amount_max' in filters:
+                conditions.append("c.amount <= ?")
+                params.append(filters['amount_max'])
+            
+            if filters.get('search'):
+                # LIKE ne replie que la casse ASCII : comparaison sur normalize_text
+                # (casse et accents), le terme saisi étant pris littéralement
+                conditions.append(
+                    "(normalize_text(c.cheque_number) LIKE ? ESCAPE '\\' "
+                    "OR normalize_text(cl.name) LIKE ? ESCAPE '\\' "
+                    "OR normalize_text(c.depositor_name) LIKE ? ESCAPE '\\' "
+                    "OR normalize_text(bk.name) LIKE ? ESCAPE '\\')"
+                )
+                params.extend([_like_contains(normalize_text(filters['search']))] * 4)
+        
+        clause = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return clause, params
+    
+    def get_cheques(self, filters: Dict = None, limit: int = None,
+                    after: tuple = None) -> List[Dict]:
+        """Récupère les chèques avec filtres optionnels
+        
+        Pagination par clé : limit borne le nombre de lignes et after=(due_date, id)
+        reprend après la dernière ligne de la page précédente.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
             
-            params = []
-            conditions = []
-            
-            if filters:
-                if 'status' in filters:
-                    conditions.append("c.status = ?")
-                    params.append(filters['status'])
-                
-                if 'bank_id' in filters:
-                    conditions.append("bk.id = ?")
-                    params.append(filters['bank_id'])
-                
-                if 'branch_id' in filters:
-                    conditions.append("c.branch_id = ?")
-                    params.append(filters['branch_id'])
-                
-                if 'client_id' in filters:
-                    conditions.append("c.client_id = ?")
-                    params.append(filters['client_id'])
-                
-                if 'date_from' in filters:
-                    conditions.append("c.due_date >= ?")
-                    params.append(filters['date_from'])
-                
-                if 'date_to' in filters:
-                    conditions.append("c.due_date <= ?")
-                    params.append(filters['date_to'])
-                
-                if 'amount_min' in filters:
-                    conditions.append("c.amount >= ?")
-                    params.append(filters['amount_min'])
-                
-                if 'amount_max' in filters:
-                    conditions.append("c.amount <= ?")
-                    params.append(filters['amount_max'])
+            where, params = self._cheque_filter_clause(filters)
+            if after is not None:
+                where += (" AND " if where else " WHERE ") + "(c.due_date, c.id) < (?, ?)"
+                params.extend(after)
             
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
+            query = """
+                SELECT c.*, 
+                       cl.name as client_name, cl.type as client_type,
+                       b.name as branch_name, bk.name as bank_name
+            """ + self._CHEQUE_JOINS + where
             
-            query += " ORDER BY c.due_date DESC, c.created_at DESC"
+            query += " ORDER BY c.due_date DESC, c.id DESC"
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
             
             cursor.execute(query, params)
             columns = [desc[0] for desc in cursor.description]
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
+    def get_cheques_summary(self, filters: Dict = None) -> Dict:
+        """Nombre et montant total des chèques correspondant aux filtres"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            
+            where, params = self._cheque_filter_clause(filters)
+            cursor.execute(
+                "SELECT COUNT(*), COALESCE(SUM(c.amount), 0)" + self._CHEQUE_JOINS + where,
+                params
+            )
+            count, total = cursor.fetchone()
+            return {'count': count, 'total': total}
+    
+    def delete_cheque(self, cheque_ids) -> int:
+        """Supprime un chèque (ou une liste de chèques) ; retourne le nombre supprimé"""
+        if isinstance(cheque_ids, int):
+            cheque_ids = [cheque_ids]
+        
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "DELETE FROM cheques WHERE id = ?",
+                [(cheque_id,) for cheque_id in cheque_ids]
+            )
+            return cursor.rowcount
+    
     def update_cheque_status(self, cheque_id: int, new_status: str, user_id: int = None) -> bool:
         """Met à jour le statut d'un chèque"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "UPDATE cheques SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
@@ -462,7 +637,7 @@ class DatabaseManager:
     
     def check_duplicate_cheque(self, cheque_number: str, branch_id: int) -> bool:
         """Vérifie si un chèque existe déjà"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT COUNT(*) FROM cheques WHERE cheque_number = ? AND branch_id = ?",
@@ -470,28 +645,47 @@ class DatabaseManager:
             )
             return cursor.fetchone()[0] > 0
     
-    def get_cheques_due_soon(self, days: int = 3) -> List[Dict]:
-        """Récupère les chèques arrivant à échéance bientôt"""
-        with sqlite3.connect(self.db_path) as conn:
+    def get_cheques_due_soon(self, days: int = 3, limit: int = None) -> List[Dict]:
+        """Récupère les chèques arrivant à échéance bientôt (les limit plus proches si précisé)"""
+        with self._connect() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """SELECT c.*, cl.name as client_name, b.name as branch_name, bk.name as bank_name
+            query = """SELECT c.*, cl.name as client_name, b.name as branch_name, bk.name as bank_name
                    FROM cheques c
                    LEFT JOIN clients cl ON c.client_id = cl.id
                    LEFT JOIN branches b ON c.branch_id = b.id
                    LEFT JOIN banks bk ON b.bank_id = bk.id
                    WHERE c.status IN ('en_attente', 'depose') 
-                   AND date(c.due_date) BETWEEN date('now') AND date('now', '+{} days')
-                   ORDER BY c.due_date""".format(days)
-            )
+                   AND date(c.due_date) BETWEEN date('now') AND date('now', '+' || ? || ' days')
+                   ORDER BY c.due_date"""
+            params = [days]
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            
+            cursor.execute(query, params)
             columns = [desc[0] for desc in cursor.description]
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
+    def get_cheques_due_soon_minimal(self, days: int = 3) -> List[tuple]:
+        """Chèques arrivant à échéance, réduits à (id, numéro, client, échéance)"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """SELECT c.id, c.cheque_number, COALESCE(cl.name, 'Client inconnu'), c.due_date
+                   FROM cheques c
+                   LEFT JOIN clients cl ON c.client_id = cl.id
+                   WHERE c.status IN ('en_attente', 'depose') 
+                   AND date(c.due_date) BETWEEN date('now') AND date('now', '+' || ? || ' days')
+                   ORDER BY c.due_date""",
+                (days,)
+            )
+            return cursor.fetchall()
+    
     # === MÉTHODES POUR LES STATISTIQUES ===
     
     def get_dashboard_stats(self) -> Dict:
         """Récupère les statistiques pour le tableau de bord"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             stats = {}
@@ -537,8 +731,30 @@ class DatabaseManager:
             """)
             stats['top_banks'] = cursor.fetchall()
             
+            # Évolution mensuelle sur 6 mois : (mois, nombre, montant)
+            # (parcours de l'index couvrant due_date, amount ; le mois est le préfixe de la date ISO)
+            cursor.execute("""
+                SELECT 
+                    substr(due_date, 1, 7) as month,
+                    COUNT(*) as count,
+                    SUM(amount) as total
+                FROM cheques 
+                WHERE due_date >= date('now', '-6 months')
+                GROUP BY month
+                ORDER BY month
+            """)
+            stats['temporal'] = cursor.fetchall()
+            
             return stats
     
+    def get_cheques_signature(self) -> tuple:
+        """Signature peu coûteuse des chèques : change à chaque écriture sur les chèques
+        ou les clients (compteur incrémenté par trigger) ou quand la date du jour change"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT value, date('now') FROM change_counter WHERE id = 1")
+            return cursor.fetchone()
+    
     # === MÉTHODES POUR LES NOTIFICATIONS ===
     
     def _create_status_notification(self, cursor, cheque_id: int, new_status: str, user_id: int):
@@ -562,7 +778,7 @@ class DatabaseManager:
         """Crée des notifications pour les chèques arrivant à échéance"""
         cheques_due = self.get_cheques_due_soon()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             for cheque in cheques_due:
@@ -585,9 +801,10 @@ class DatabaseManager:
             
             conn.commit()
     
-    def get_notifications(self, user_id: int = None, unread_only: bool = False) -> List[Dict]:
-        """Récupère les notifications"""
-        with sqlite3.connect(self.db_path) as conn:
+    def get_notifications(self, user_id: int = None, unread_only: bool = False,
+                          limit: int = 50) -> List[Dict]:
+        """Récupère les notifications (les limit plus récentes)"""
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             query = "SELECT * FROM notifications"
@@ -604,17 +821,36 @@ class DatabaseManager:
             if conditions:
                 query += " WHERE " + " AND ".join(conditions)
             
-            query += " ORDER BY created_at DESC LIMIT 50"
+            query += " ORDER BY created_at DESC LIMIT ?"
+            params.append(limit)
             
             cursor.execute(query, params)
             columns = [desc[0] for desc in cursor.description]
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
     
+    def get_notifications_minimal(self, user_id: int = None, limit: int = 5) -> List[tuple]:
+        """Notifications non lues, réduites à (id, message, date)"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            
+            query = "SELECT id, message, substr(created_at, 1, 10) FROM notifications WHERE read = FALSE"
+            params = []
+            
+            if user_id:
+                query += " AND (user_id = ? OR user_id IS NULL)"
+                params.append(user_id)
+            
+            query += " ORDER BY created_at DESC LIMIT ?"
+            params.append(limit)
+            
+            cursor.execute(query, params)
+            return cursor.fetchall()
+    
     # === MÉTHODES UTILITAIRES ===
     
     def get_setting(self, key: str, default_value: str = None) -> str:
         """Récupère une valeur de paramètre"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
             result = cursor.fetchone()
@@ -622,7 +858,7 @@ class DatabaseManager:
     
     def set_setting(self, key: str, value: str):
         """Définit une valeur de paramètre"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """INSERT OR REPLACE INTO settings (key, value, updated_at) 
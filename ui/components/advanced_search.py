@@ -5,12 +5,86 @@ Advanced Search Component with Fuzzy Search and Dynamic Filters
 """
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 import sqlite3
+import sys
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence
 import re
+import heapq
+from operator import itemgetter
+from uuid import uuid4
 from difflib import SequenceMatcher
+import orjson
+
+# Case- and accent-insensitive form of text, shared with the database layer
+from database.db_manager import normalize_text as _normalize
+
+try:
+    import numpy as np
+    from rapidfuzz import fuzz, process
+except ImportError:  # Optional: vectorized fuzzy scoring
+    np = None
+    process = None
+
+try:
+    from Levenshtein import ratio as lev_ratio
+except ImportError:  # Optional: C implementation of the similarity ratio
+    lev_ratio = None
+
+try:
+    import jellyfish
+except ImportError:  # Optional: phonetic matching of names
+    jellyfish = None
+
+# Static combobox values of the custom filter dialog
+_FIELD_VALUES = ('c.cheque_number', 'c.amount', 'c.status', 'c.due_date', 'c.created_at',
+                 'cl.name', 'cl.type', 'b.name', 'bk.name')
+_OPERATOR_VALUES = ('equals', 'contains', 'greater', 'less', 'between')
+
+# Dialog strings, shared across every dialog open
+_LBL_ADD = sys.intern("Ajouter")
+_LBL_SAVE = sys.intern("Sauvegarder")
+_LBL_CANCEL = sys.intern("Annuler")
+_TITLE_WARNING = sys.intern("Attention")
+_MSG_FILL_ALL = sys.intern("Veuillez remplir tous les champs")
+_MSG_NAME_REQUIRED = sys.intern("Veuillez saisir un nom")
+
+# Any non-whitespace character (valid saved search name)
+_NAME_RE = re.compile(r'\S')
+
+# Named ttk styles, configured once per process
+_styles_initialized = False
+
+def _init_styles():
+    """Configure the ttk styles used by the search widgets"""
+    global _styles_initialized
+    if _styles_initialized:
+        return
+    
+    style = ttk.Style()
+    style.configure('Summary.TLabel', background='#f5f5f5', padding=10)
+    style.configure('Chip.TLabel', background='#e3f2fd', padding=5)
+    _styles_initialized = True
+
+# Searchable fields and their SQL columns; names also match phonetically
+_SEARCH_COLUMNS = {
+    'cheque_number': 'c.cheque_number',
+    'client_name': 'cl.name',
+    'depositor_name': 'c.depositor_name',
+    'notes': 'c.notes',
+}
+_NAME_FIELDS = ('client_name', 'depositor_name')
+
+def _ratio(a: str, b: str) -> float:
+    """Similarity ratio between two normalized strings"""
+    if lev_ratio is not None:
+        return lev_ratio(a, b)
+    return SequenceMatcher(None, a, b).ratio()
+
+def _sound(text: str) -> str:
+    """Phonetic key of text (Dupont and Dupond share one)"""
+    return jellyfish.metaphone(_normalize(text))
 
 class FuzzySearchEngine:
     """Fuzzy search engine for intelligent text matching"""
@@ -23,36 +97,130 @@ class FuzzySearchEngine:
         if not a or not b:
             return 0.0
         
-        return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+        return _ratio(_normalize(a), _normalize(b))
     
-    def fuzzy_match(self, query: str, text: str) -> bool:
-        """Check if query fuzzy matches text"""
+    def fuzzy_match(self, query: str, text: str, phonetic: bool = False) -> bool:
+        """Check if query fuzzy matches text (phonetic fallback for names)"""
         if not query or not text:
             return False
         
-        # Exact match
-        if query.lower() in text.lower():
+        if self._match_normalized(_normalize(query), text):
             return True
         
-        # Fuzzy match
-        return self.similarity(query, text) >= self.threshold
+        return phonetic and self.phonetic_match(query, text)
+    
+    def phonetic_match(self, a: str, b: str) -> bool:
+        """Check if two strings sound alike"""
+        if jellyfish is None or not a or not b:
+            return False
+        
+        return _sound(a) == _sound(b)
     
     def search_in_fields(self, query: str, fields: List[str]) -> bool:
         """Search query in multiple fields"""
+        if not query:
+            return False
+        
+        # Normalize the query once for all fields
+        query_norm = _normalize(query)
         for field in fields:
-            if field and self.fuzzy_match(query, str(field)):
+            if field and self._match_normalized(query_norm, str(field)):
                 return True
         return False
+    
+    def _match_normalized(self, query_norm: str, text: str) -> bool:
+        """Match an already normalized query against text"""
+        text_norm = _normalize(text)
+        
+        # Exact match, no ratio needed
+        if query_norm in text_norm:
+            return True
+        
+        # Fuzzy match
+        return _ratio(query_norm, text_norm) >= self.threshold
+    
+    def match_many(self, query: str, candidates: List[List[str]],
+                   phonetic_columns: List[int] = ()) -> List[bool]:
+        """Check query against the fields of many candidates at once.
+        
+        Fields at phonetic_columns (names) also match when they sound alike.
+        """
+        scores = self.score_many(query, candidates, phonetic_columns)
+        return [score >= self.threshold for score in scores]
+    
+    def score_many(self, query: str, candidates: List[List[str]],
+                   phonetic_columns: List[int] = ()) -> List[float]:
+        """Best similarity (0-1) of query against the fields of each candidate"""
+        if not query or not candidates:
+            return [0.0] * len(candidates)
+        
+        query_norm = _normalize(query)
+        
+        if process is None:
+            scores = [max((self._score_normalized(query_norm, str(field))
+                           for field in fields if field), default=0.0)
+                      for fields in candidates]
+        else:
+            # Score every field of every candidate in a single call
+            field_count = len(candidates[0])
+            choices = [_normalize(str(field)) if field else ''
+                       for fields in candidates for field in fields]
+            matrix = process.cdist([query_norm], choices, scorer=fuzz.WRatio,
+                                   dtype=np.uint8, workers=-1,
+                                   score_cutoff=int(self.threshold * 100))[0]
+            if field_count:
+                best = matrix.reshape(len(candidates), field_count).max(axis=1)
+                scores = (best / 100.0).tolist()
+            else:
+                scores = [0.0] * len(candidates)
+        
+        # Phonetic fallback on name fields counts as a threshold match
+        if phonetic_columns and jellyfish is not None:
+            query_sound = _sound(query)
+            for i, fields in enumerate(candidates):
+                if scores[i] < self.threshold and any(
+                        fields[column] and _sound(str(fields[column])) == query_sound
+                        for column in phonetic_columns):
+                    scores[i] = self.threshold
+        
+        return scores
+    
+    def _score_normalized(self, query_norm: str, text: str) -> float:
+        """Similarity of an already normalized query against text"""
+        text_norm = _normalize(text)
+        
+        # Exact match is a perfect score
+        if query_norm in text_norm:
+            return 1.0
+        
+        return _ratio(query_norm, text_norm)
 
 class DynamicFilter:
     """Dynamic filter that can be added/removed at runtime"""
     
-    def __init__(self, field: str, operator: str, value: Any, label: str = None):
+    __slots__ = ('field', 'operator', 'value', '_label', 'category', 'active', '_uid')
+    
+    def __init__(self, field: str, operator: str, value: Any, label: str = None,
+                 category: str = None):
         self.field = field
-        self.operator = operator  # 'equals', 'contains', 'greater', 'less', 'between', 'in'
+        self.operator = operator  # 'equals', 'contains', 'greater', 'less', 'between', 'in', 'overdue'
         self.value = value
-        self.label = label or f"{field} {operator} {value}"
+        self._label = label  # Default label is built on first access
+        self.category = category  # 'status', 'date', 'amount' or None for custom filters
         self.active = True
+        self._uid = uuid4().int
+    
+    @property
+    def label(self) -> str:
+        """Display label, formatted once and then cached"""
+        if not self._label:
+            self._label = f"{self.field} {self.operator} {self.value}"
+        return self._label
+    
+    @property
+    def key(self):
+        """Key in the active filters: its category, or a unique id for custom filters"""
+        return self.category or self._uid
     
     def to_sql(self) -> tuple[str, List[Any]]:
         """Convert filter to SQL WHERE clause"""
@@ -72,13 +240,17 @@ class DynamicFilter:
         elif self.operator == 'in':
             placeholders = ','.join(['?' for _ in self.value])
             return f"{self.field} IN ({placeholders})", self.value
+        elif self.operator == 'overdue':
+            return f"{self.field} < date('now') AND c.status IN ('en_attente', 'depose')", []
         else:
             return "", []
 
 class SavedSearch:
     """Saved search configuration"""
     
-    def __init__(self, name: str, query: str, filters: List[DynamicFilter], 
+    __slots__ = ('name', 'query', 'filters', 'sort_field', 'sort_order', 'created_at', 'last_used')
+    
+    def __init__(self, name: str, query: str, filters: Sequence[DynamicFilter], 
                  sort_field: str = None, sort_order: str = 'ASC'):
         self.name = name
         self.query = query
@@ -91,6 +263,10 @@ class SavedSearch:
 class AdvancedSearchFrame(ttk.Frame):
     """Advanced search component with fuzzy search and dynamic filters"""
     
+    FETCH_BATCH_SIZE = 500
+    MAX_RESULTS = 10000
+    RANKED_PAGE_SIZE = 200
+    
     def __init__(self, parent, db_manager, on_results_callback=None):
         super().__init__(parent)
         self.db = db_manager
@@ -98,14 +274,20 @@ class AdvancedSearchFrame(ttk.Frame):
         
         # Search components
         self.fuzzy_engine = FuzzySearchEngine()
-        self.active_filters = []
+        self.active_filters = {}  # key -> DynamicFilter, in insertion order
         self.saved_searches = []
+        self._chip_widgets = {}
         
         # Search state
         self.current_results = []
         self.search_history = []
+        self._last_search = None
+        self._rows_fetched = 0
+        self._sql_has_more = False
+        self._ranked_pending = []
         
         # UI setup
+        _init_styles()
         self.setup_ui()
         
         # Load saved searches
@@ -284,6 +466,10 @@ class AdvancedSearchFrame(ttk.Frame):
         ttk.Label(results_frame, textvariable=self.results_info_var, 
                  font=('Arial', 10)).pack(side=tk.LEFT)
         
+        # Load more (shown only when results were capped)
+        self.load_more_button = ttk.Button(results_frame, text="⏬ Charger plus", 
+                                           command=self.load_more_results)
+        
         # Search time
         self.search_time_var = tk.StringVar()
         ttk.Label(results_frame, textvariable=self.search_time_var, 
@@ -327,43 +513,129 @@ class AdvancedSearchFrame(ttk.Frame):
         try:
             query = self.search_var.get().strip()
             
-            # Build SQL query
-            sql_query, params = self.build_search_query(query)
+            # Snapshot the field toggles once instead of reading Tk vars per row
+            enabled = {field: var.get() for field, var in self.search_fields.items()}
             
-            # Execute search
-            with sqlite3.connect(self.db.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql_query, params)
-                
-                # Get column names
-                columns = [desc[0] for desc in cursor.description]
-                
-                # Fetch results
-                rows = cursor.fetchall()
-                
-                # Convert to dictionaries
-                self.current_results = [dict(zip(columns, row)) for row in rows]
-            
-            # Apply fuzzy search if enabled
-            if self.fuzzy_enabled.get() and query:
-                self.current_results = self.apply_fuzzy_filter(query, self.current_results)
+            # Execute search from the first row
+            self._last_search = (query, enabled)
+            self._rows_fetched = 0
+            self._ranked_pending = []
+            self.current_results = []
+            has_more = self.fetch_results(query, enabled, mode='replace')
             
             # Update UI
             search_time = (datetime.now() - start_time).total_seconds()
-            self.update_results_info(len(self.current_results), search_time)
+            self.update_results_info(len(self.current_results), search_time, has_more)
             
             # Add to search history
             self.add_to_search_history(query)
-            
-            # Callback with results
-            if self.on_results_callback:
-                self.on_results_callback(self.current_results)
                 
         except Exception as e:
             self.results_info_var.set(f"Erreur: {e}")
     
-    def build_search_query(self, query: str) -> tuple[str, List[Any]]:
-        """Build SQL query from search criteria"""
+    def load_more_results(self):
+        """Fetch the next batch of results of the last search"""
+        if not self._last_search:
+            return
+        
+        start_time = datetime.now()
+        
+        try:
+            query, enabled = self._last_search
+            
+            # Serve ranked rows already scored before reading more from SQL
+            if self._ranked_pending:
+                self.show_ranked_page('append')
+                has_more = self._sql_has_more or bool(self._ranked_pending)
+            else:
+                has_more = self.fetch_results(query, enabled, mode='append')
+            
+            search_time = (datetime.now() - start_time).total_seconds()
+            self.update_results_info(len(self.current_results), search_time, has_more)
+            
+        except Exception as e:
+            self.results_info_var.set(f"Erreur: {e}")
+    
+    def fetch_results(self, query: str, enabled: Dict[str, bool], mode: str) -> bool:
+        """Stream up to MAX_RESULTS rows to the callback in batches.
+        
+        Returns True when more rows are available past the cap.
+        """
+        # SQL keeps the candidates: rows containing the query, plus names that
+        # sound like it when phonetic matching is available (Dupont/Dupond).
+        # With fuzzy search on, the candidates are then scored to be shown best first.
+        rank = bool(self.fuzzy_enabled.get() and query and any(enabled.values()))
+        phonetic = rank and jellyfish is not None
+        
+        # Build SQL query
+        sql_query, params = self.build_search_query(query, enabled, phonetic=phonetic)
+        sql_query += " LIMIT ? OFFSET ?"
+        params = params + [self.MAX_RESULTS + 1, self._rows_fetched]
+        
+        fetched = 0
+        with sqlite3.connect(self.db.db_path) as conn:
+            conn.create_function("normalize_text", 1, _normalize, deterministic=True)
+            if phonetic:
+                conn.create_function("sound_text", 1, _sound, deterministic=True)
+            cursor = conn.cursor()
+            cursor.execute(sql_query, params)
+            
+            # Get column names
+            columns = [desc[0] for desc in cursor.description]
+            
+            while fetched < self.MAX_RESULTS:
+                batch = cursor.fetchmany(min(self.FETCH_BATCH_SIZE, self.MAX_RESULTS - fetched))
+                if not batch:
+                    break
+                fetched += len(batch)
+                
+                # Convert to dictionaries
+                rows = [dict(zip(columns, row)) for row in batch]
+                
+                # Ranked rows are delivered once all batches are scored
+                if rank:
+                    self._ranked_pending.extend(self.score_results(query, rows, enabled))
+                    continue
+                
+                self.current_results.extend(rows)
+                
+                # Callback with this batch
+                if self.on_results_callback:
+                    self.on_results_callback(rows, mode)
+                    mode = 'append'
+            
+            self._sql_has_more = cursor.fetchone() is not None
+        
+        self._rows_fetched += fetched
+        
+        if rank:
+            self.show_ranked_page(mode)
+        elif mode == 'replace' and self.on_results_callback:
+            # Make sure a fresh search always clears the previous results
+            self.on_results_callback([], mode)
+        
+        return self._sql_has_more or bool(self._ranked_pending)
+    
+    def show_ranked_page(self, mode: str):
+        """Deliver the next best-scored page of pending ranked results"""
+        page = heapq.nlargest(self.RANKED_PAGE_SIZE, self._ranked_pending, key=itemgetter(0))
+        
+        shown = {id(row) for _, row in page}
+        self._ranked_pending = [item for item in self._ranked_pending if id(item[1]) not in shown]
+        
+        rows = [row for _, row in page]
+        self.current_results.extend(rows)
+        
+        if self.on_results_callback:
+            self.on_results_callback(rows, mode)
+    
+    def build_search_query(self, query: str, enabled: Dict[str, bool] = None,
+                           phonetic: bool = False) -> tuple[str, List[Any]]:
+        """Build SQL query from search criteria (phonetic=True also matches
+        names by their sound_text key)"""
+        if enabled is None:
+            enabled = {field: var.get() for field, var in self.search_fields.items()}
+        
         base_query = """
             SELECT c.*, 
                    cl.name as client_name, cl.type as client_type,
@@ -377,28 +649,28 @@ class AdvancedSearchFrame(ttk.Frame):
         where_clauses = []
         params = []
         
-        # Text search
+        # Text search (accent-insensitive, see normalize_text)
         if query:
+            query_norm = _normalize(query)
+            query_sound = _sound(query) if phonetic else None
             search_conditions = []
             
-            for field, enabled in self.search_fields.items():
-                if enabled.get():
-                    if field == 'cheque_number':
-                        search_conditions.append("c.cheque_number LIKE ?")
-                    elif field == 'client_name':
-                        search_conditions.append("cl.name LIKE ?")
-                    elif field == 'depositor_name':
-                        search_conditions.append("c.depositor_name LIKE ?")
-                    elif field == 'notes':
-                        search_conditions.append("c.notes LIKE ?")
+            for field, on in enabled.items():
+                column = _SEARCH_COLUMNS.get(field)
+                if on and column:
+                    search_conditions.append(f"normalize_text({column}) LIKE ?")
+                    params.append(f"%{query_norm}%")
                     
-                    params.append(f"%{query}%")
+                    # Names that sound like the query (Dupont/Dupond)
+                    if phonetic and field in _NAME_FIELDS:
+                        search_conditions.append(f"sound_text({column}) = ?")
+                        params.append(query_sound)
             
             if search_conditions:
                 where_clauses.append(f"({' OR '.join(search_conditions)})")
         
         # Apply dynamic filters
-        for filter_obj in self.active_filters:
+        for filter_obj in self.active_filters.values():
             if filter_obj.active:
                 filter_sql, filter_params = filter_obj.to_sql()
                 if filter_sql:
@@ -409,76 +681,63 @@ class AdvancedSearchFrame(ttk.Frame):
         if where_clauses:
             base_query += " WHERE " + " AND ".join(where_clauses)
         
-        base_query += " ORDER BY c.created_at DESC"
+        base_query += " ORDER BY c.created_at DESC, c.id DESC"
         
         return base_query, params
     
-    def apply_fuzzy_filter(self, query: str, results: List[Dict]) -> List[Dict]:
-        """Apply fuzzy search filtering to results"""
-        if not query:
-            return results
-        
-        fuzzy_results = []
-        
-        for result in results:
-            # Check fuzzy match in enabled fields
-            search_fields = []
-            
-            if self.search_fields['cheque_number'].get():
-                search_fields.append(result.get('cheque_number', ''))
-            if self.search_fields['client_name'].get():
-                search_fields.append(result.get('client_name', ''))
-            if self.search_fields['depositor_name'].get():
-                search_fields.append(result.get('depositor_name', ''))
-            if self.search_fields['notes'].get():
-                search_fields.append(result.get('notes', ''))
-            
-            if self.fuzzy_engine.search_in_fields(query, search_fields):
-                fuzzy_results.append(result)
-        
-        return fuzzy_results
+    def score_results(self, query: str, results: List[Dict],
+                      enabled: Dict[str, bool]) -> List[tuple]:
+        """Pair each result with its fuzzy score in the enabled fields"""
+        fields_to_check = [field for field, on in enabled.items() if on]
+        candidates = [[result.get(field, '') for field in fields_to_check]
+                      for result in results]
+        name_columns = [i for i, field in enumerate(fields_to_check)
+                        if field in _NAME_FIELDS]
+        
+        scores = self.fuzzy_engine.score_many(query, candidates, name_columns)
+        return list(zip(scores, results))
     
     def add_status_filter(self, status: str):
         """Add status filter"""
-        # Remove existing status filters
-        self.active_filters = [f for f in self.active_filters if f.field != 'c.status']
-        
         if status == "overdue":
             # Special case for overdue cheques
             filter_obj = DynamicFilter(
                 field="c.due_date",
-                operator="less",
+                operator="overdue",
                 value=date.today().isoformat(),
-                label="En retard"
+                label="En retard",
+                category="status"
             )
-            filter_obj.to_sql = lambda: ("c.due_date < date('now') AND c.status IN ('en_attente', 'depose')", [])
         elif status:
             filter_obj = DynamicFilter(
                 field="c.status",
                 operator="equals",
                 value=status,
-                label=f"Statut: {status}"
+                label=f"Statut: {status}",
+                category="status"
             )
         else:
-            return  # "Tous" - no filter
+            # "Tous" - no filter
+            if self.active_filters.pop("status", None) is not None:
+                self.update_filters_display()
+                self.perform_search()
+            return
         
-        self.active_filters.append(filter_obj)
+        # Replaces any existing status filter
+        self.active_filters["status"] = filter_obj
         self.update_filters_display()
         self.perform_search()
     
     def add_date_filter(self, days: int):
         """Add date range filter"""
-        # Remove existing date filters
-        self.active_filters = [f for f in self.active_filters 
-                              if not f.field.startswith('c.') or 'date' not in f.field]
-        
         if days == 0:
             # Today
             filter_obj = DynamicFilter(
                 field="date(c.created_at)",
                 operator="equals",
                 value=date.today().isoformat(),
-                label="Aujourd'hui"
+                label="Aujourd'hui",
+                category="date"
             )
         else:
             # Last N days
@@ -487,34 +746,36 @@ class AdvancedSearchFrame(ttk.Frame):
                 field="c.created_at",
                 operator="greater",
                 value=start_date,
-                label=f"Derniers {days} jours"
+                label=f"Derniers {days} jours",
+                category="date"
             )
         
-        self.active_filters.append(filter_obj)
+        # Replaces any existing date filter
+        self.active_filters["date"] = filter_obj
         self.update_filters_display()
         self.perform_search()
     
     def add_amount_filter(self, min_amount: float, max_amount: float):
         """Add amount range filter"""
-        # Remove existing amount filters
-        self.active_filters = [f for f in self.active_filters if f.field != 'c.amount']
-        
         if max_amount == float('inf'):
             filter_obj = DynamicFilter(
                 field="c.amount",
                 operator="greater",
                 value=min_amount,
-                label=f"Montant > {min_amount:,.0f}"
+                label=f"Montant > {min_amount:,.0f}",
+                category="amount"
             )
         else:
             filter_obj = DynamicFilter(
                 field="c.amount",
                 operator="between",
                 value=[min_amount, max_amount],
-                label=f"Montant: {min_amount:,.0f} - {max_amount:,.0f}"
+                label=f"Montant: {min_amount:,.0f} - {max_amount:,.0f}",
+                category="amount"
             )
         
-        self.active_filters.append(filter_obj)
+        # Replaces any existing amount filter
+        self.active_filters["amount"] = filter_obj
         self.update_filters_display()
         self.perform_search()
     
@@ -524,43 +785,56 @@ class AdvancedSearchFrame(ttk.Frame):
     
     def add_custom_filter(self, filter_obj: DynamicFilter):
         """Add custom filter"""
-        self.active_filters.append(filter_obj)
+        self.active_filters[filter_obj.key] = filter_obj
         self.update_filters_display()
         self.perform_search()
     
     def update_filters_display(self):
         """Update the display of active filters"""
-        # Clear existing filter widgets
-        for widget in self.filters_container.winfo_children():
-            widget.destroy()
+        # Destroy chips of removed filters only
+        active_uids = {filter_obj._uid for filter_obj in self.active_filters.values()}
+        for uid in list(self._chip_widgets):
+            if uid not in active_uids:
+                self._chip_widgets.pop(uid).destroy()
         
         if not self.active_filters:
             self.filter_summary_var.set("Aucun filtre actif")
             return
         
-        # Create filter chips
-        for i, filter_obj in enumerate(self.active_filters):
+        # Create chips for new filters only
+        for key, filter_obj in self.active_filters.items():
+            if filter_obj._uid in self._chip_widgets:
+                continue
+            
             filter_frame = ttk.Frame(self.filters_container)
             filter_frame.pack(side=tk.LEFT, padx=2, pady=2)
             
             # Filter label
-            label = ttk.Label(filter_frame, text=filter_obj.label, 
-                             background="#e3f2fd", padding=5)
+            label = ttk.Label(filter_frame, text=filter_obj.label, style='Chip.TLabel')
             label.pack(side=tk.LEFT)
             
             # Remove button
             remove_btn = ttk.Button(filter_frame, text="✕", width=3,
-                                   command=lambda idx=i: self.remove_filter(idx))
+                                   command=lambda k=key: self.remove_filter(k))
             remove_btn.pack(side=tk.LEFT)
+            
+            self._chip_widgets[filter_obj._uid] = filter_frame
+        
+        # Re-pack only if the chips drifted from the filters order
+        chips = [self._chip_widgets[f._uid] for f in self.active_filters.values()]
+        if self.filters_container.pack_slaves() != chips:
+            for chip in chips:
+                chip.pack_forget()
+            for chip in chips:
+                chip.pack(side=tk.LEFT, padx=2, pady=2)
         
         # Update summary
-        active_count = len([f for f in self.active_filters if f.active])
+        active_count = len([f for f in self.active_filters.values() if f.active])
         self.filter_summary_var.set(f"{active_count} filtre(s) actif(s)")
     
-    def remove_filter(self, index: int):
-        """Remove filter by index"""
-        if 0 <= index < len(self.active_filters):
-            del self.active_filters[index]
+    def remove_filter(self, key):
+        """Remove filter by key"""
+        if self.active_filters.pop(key, None) is not None:
             self.update_filters_display()
             self.perform_search()
     
@@ -575,14 +849,22 @@ class AdvancedSearchFrame(ttk.Frame):
         self.search_var.set("")
         self.clear_all_filters()
         self.current_results.clear()
+        self._last_search = None
+        self._ranked_pending = []
+        self.load_more_button.pack_forget()
         self.results_info_var.set("Recherche effacée")
         
         if self.on_results_callback:
-            self.on_results_callback([])
+            self.on_results_callback([], 'replace')
     
-    def update_results_info(self, count: int, search_time: float):
+    def update_results_info(self, count: int, search_time: float, has_more: bool = False):
         """Update results information display"""
-        self.results_info_var.set(f"📊 {count} résultat(s) trouvé(s)")
+        if has_more:
+            self.results_info_var.set(f"📊 {count} premier(s) résultat(s) affiché(s)")
+            self.load_more_button.pack(side=tk.LEFT, padx=(10, 0))
+        else:
+            self.results_info_var.set(f"📊 {count} résultat(s) trouvé(s)")
+            self.load_more_button.pack_forget()
         self.search_time_var.set(f"⏱️ {search_time:.2f}s")
     
     def add_to_search_history(self, query: str):
@@ -595,10 +877,12 @@ class AdvancedSearchFrame(ttk.Frame):
     def save_current_search(self):
         """Save current search configuration"""
         dialog = SaveSearchDialog(self, self.search_var.get(), 
-                                 self.active_filters.copy(), self.save_search)
+                                 list(self.active_filters.values()), self.save_search)
     
     def save_search(self, saved_search: SavedSearch):
         """Save search configuration"""
+        # Saving again under an existing name replaces that search
+        self.saved_searches = [s for s in self.saved_searches if s.name != saved_search.name]
         self.saved_searches.append(saved_search)
         self.update_saved_searches_combo()
         self.persist_saved_searches()
@@ -623,7 +907,7 @@ class AdvancedSearchFrame(ttk.Frame):
         if saved_search:
             # Load search criteria
             self.search_var.set(saved_search.query)
-            self.active_filters = saved_search.filters.copy()
+            self.active_filters = {f.key: f for f in saved_search.filters}
             
             # Update display
             self.update_filters_display()
@@ -666,7 +950,7 @@ class AdvancedSearchFrame(ttk.Frame):
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         name TEXT UNIQUE NOT NULL,
                         query TEXT,
-                        filters TEXT,
+                        filters BLOB,
                         sort_field TEXT,
                         sort_order TEXT,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -679,7 +963,7 @@ class AdvancedSearchFrame(ttk.Frame):
                 
                 for row in cursor.fetchall():
                     try:
-                        filters_data = json.loads(row[3]) if row[3] else []
+                        filters_data = orjson.loads(row[3]) if row[3] else []
                         filters = []
                         
                         for filter_data in filters_data:
@@ -687,14 +971,15 @@ class AdvancedSearchFrame(ttk.Frame):
                                 field=filter_data['field'],
                                 operator=filter_data['operator'],
                                 value=filter_data['value'],
-                                label=filter_data['label']
+                                label=filter_data['label'],
+                                category=filter_data.get('category')
                             )
                             filters.append(filter_obj)
                         
                         saved_search = SavedSearch(
                             name=row[1],
                             query=row[2] or '',
-                            filters=filters,
+                            filters=tuple(filters),
                             sort_field=row[4],
                             sort_order=row[5] or 'ASC'
                         )
@@ -717,8 +1002,6 @@ class AdvancedSearchFrame(ttk.Frame):
     def persist_saved_searches(self):
         """Persist saved searches to database"""
         try:
-            import json
-            
             with sqlite3.connect(self.db.db_path) as conn:
                 cursor = conn.cursor()
                 
@@ -733,7 +1016,8 @@ class AdvancedSearchFrame(ttk.Frame):
                             'field': filter_obj.field,
                             'operator': filter_obj.operator,
                             'value': filter_obj.value,
-                            'label': filter_obj.label
+                            'label': filter_obj.label,
+                            'category': filter_obj.category
                         })
                     
                     cursor.execute('''
@@ -743,7 +1027,7 @@ class AdvancedSearchFrame(ttk.Frame):
                     ''', (
                         search.name,
                         search.query,
-                        json.dumps(filters_data),
+                        orjson.dumps(filters_data),
                         search.sort_field,
                         search.sort_order,
                         search.created_at.isoformat(),
@@ -754,59 +1038,92 @@ class AdvancedSearchFrame(ttk.Frame):
             print(f"Error persisting saved searches: {e}")
 
 class AddFilterDialog:
-    """Dialog for adding custom filters"""
+    """Dialog for adding custom filters (built once, then reused)"""
+    
+    _instance = None
+    
+    def __new__(cls, parent, callback):
+        instance = cls._instance
+        if instance is None or instance.parent is not parent or not instance.dialog.winfo_exists():
+            instance = super().__new__(cls)
+            instance.dialog = None
+            cls._instance = instance
+        return instance
     
     def __init__(self, parent, callback):
         self.parent = parent
         self.callback = callback
         
-        self.dialog = tk.Toplevel(parent)
-        self.dialog.title("Ajouter un Filtre")
-        self.dialog.geometry("400x300")
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        
-        self.setup_ui()
+        if self.dialog is None:
+            self.dialog = tk.Toplevel(parent)
+            self.dialog.withdraw()  # Build offscreen, show once
+            self.dialog.title("Ajouter un Filtre")
+            self.dialog.geometry("400x300")
+            self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+            
+            # Populate first (setup_ui ends with the layout pass), then show and make modal
+            self.setup_ui()
+            self.dialog.deiconify()
+            self.dialog.transient(parent)
+            self.dialog.grab_set()
+        else:
+            # Reuse the existing widgets
+            self.field_var.set("")
+            self.operator_var.set("")
+            self.value_var.set("")
+            self.dialog.deiconify()
+            self.dialog.grab_set()
     
     def setup_ui(self):
         """Setup dialog UI"""
-        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame = ttk.Frame(self.dialog, padding=20, width=400, height=300)
         main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.grid_propagate(False)
         
         # Field selection
-        ttk.Label(main_frame, text="Champ:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        
-        self.field_var = tk.StringVar()
+        self.field_var = tk.StringVar(value="")
         field_combo = ttk.Combobox(main_frame, textvariable=self.field_var, state="readonly")
-        field_combo['values'] = [
-            'c.cheque_number', 'c.amount', 'c.status', 'c.due_date', 'c.created_at',
-            'cl.name', 'cl.type', 'b.name', 'bk.name'
-        ]
-        field_combo.grid(row=0, column=1, sticky=tk.EW, pady=5, padx=(10, 0))
+        field_combo['values'] = _FIELD_VALUES
         
         # Operator selection
-        ttk.Label(main_frame, text="Opérateur:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        
-        self.operator_var = tk.StringVar()
+        self.operator_var = tk.StringVar(value="")
         operator_combo = ttk.Combobox(main_frame, textvariable=self.operator_var, state="readonly")
-        operator_combo['values'] = ['equals', 'contains', 'greater', 'less', 'between']
-        operator_combo.grid(row=1, column=1, sticky=tk.EW, pady=5, padx=(10, 0))
+        operator_combo['values'] = _OPERATOR_VALUES
         
         # Value input
-        ttk.Label(main_frame, text="Valeur:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        
-        self.value_var = tk.StringVar()
-        ttk.Entry(main_frame, textvariable=self.value_var).grid(row=2, column=1, sticky=tk.EW, pady=5, padx=(10, 0))
+        self.value_var = tk.StringVar(value="")
+        value_entry = ttk.Entry(main_frame, textvariable=self.value_var)
+        
+        # Lay out all rows in one pass
+        rows = [
+            ("Champ:", field_combo),
+            ("Opérateur:", operator_combo),
+            ("Valeur:", value_entry)
+        ]
+        for row, (label_text, widget) in enumerate(rows):
+            ttk.Label(main_frame, text=label_text).grid(row=row, column=0, sticky=tk.W, pady=5)
+            widget.grid(row=row, column=1, sticky=tk.EW, pady=5, padx=(10, 0))
         
         # Buttons
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=3, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=len(rows), column=0, columnspan=2, pady=20)
         
-        ttk.Button(button_frame, text="Ajouter", command=self.add_filter).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Annuler", command=self.dialog.destroy).pack(side=tk.LEFT, padx=5)
+        buttons = [
+            ttk.Button(button_frame, text=_LBL_ADD, command=self.add_filter, takefocus=0),
+            ttk.Button(button_frame, text=_LBL_CANCEL, command=self.close, takefocus=0)
+        ]
+        for column, button in enumerate(buttons):
+            button.grid(row=0, column=column, padx=5)
+        
+        # Buttons are out of the tab order, keep them reachable from the keyboard
+        self.dialog.bind('<Return>', lambda e: self.add_filter())
+        self.dialog.bind('<Escape>', lambda e: self.close())
         
         # Configure grid weights
         main_frame.columnconfigure(1, weight=1)
+        
+        # Single layout pass
+        main_frame.update_idletasks()
     
     def add_filter(self):
         """Add the configured filter"""
@@ -814,26 +1131,40 @@ class AddFilterDialog:
         operator = self.operator_var.get()
         value = self.value_var.get()
         
-        if not all([field, operator, value]):
-            tk.messagebox.showwarning("Attention", "Veuillez remplir tous les champs")
+        if not (field and operator and value):
+            messagebox.showwarning(_TITLE_WARNING, _MSG_FILL_ALL)
             return
         
         # Create filter
         filter_obj = DynamicFilter(
             field=field,
             operator=operator,
-            value=value,
-            label=f"{field} {operator} {value}"
+            value=value
         )
         
         # Callback
         self.callback(filter_obj)
         
         # Close dialog
-        self.dialog.destroy()
+        self.close()
+    
+    def close(self):
+        """Hide the dialog, keeping its widgets for the next use"""
+        self.dialog.grab_release()
+        self.dialog.withdraw()
 
 class SaveSearchDialog:
-    """Dialog for saving search configurations"""
+    """Dialog for saving search configurations (built once, then reused)"""
+    
+    _instance = None
+    
+    def __new__(cls, parent, query: str, filters: List[DynamicFilter], callback):
+        instance = cls._instance
+        if instance is None or instance.parent is not parent or not instance.dialog.winfo_exists():
+            instance = super().__new__(cls)
+            instance.dialog = None
+            cls._instance = instance
+        return instance
     
     def __init__(self, parent, query: str, filters: List[DynamicFilter], callback):
         self.parent = parent
@@ -841,61 +1172,90 @@ class SaveSearchDialog:
         self.filters = filters
         self.callback = callback
         
-        self.dialog = tk.Toplevel(parent)
-        self.dialog.title("Sauvegarder la Recherche")
-        self.dialog.geometry("350x200")
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        
-        self.setup_ui()
+        if self.dialog is None:
+            self.dialog = tk.Toplevel(parent)
+            self.dialog.withdraw()  # Build offscreen, show once
+            self.dialog.title("Sauvegarder la Recherche")
+            self.dialog.geometry("350x200")
+            self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+            
+            # Populate first (setup_ui ends with the layout pass), then show and make modal
+            _init_styles()
+            self.setup_ui()
+            self.dialog.deiconify()
+            self.dialog.transient(parent)
+            self.dialog.grab_set()
+        else:
+            # Reuse the existing widgets
+            self.name_var.set("")
+            self.summary_label.configure(text=self.summary_text())
+            self.dialog.deiconify()
+            self.dialog.grab_set()
     
     def setup_ui(self):
         """Setup dialog UI"""
-        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame = ttk.Frame(self.dialog, padding=20, width=350, height=200)
         main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.pack_propagate(False)
         
         # Name input
-        ttk.Label(main_frame, text="Nom de la recherche:").pack(anchor=tk.W, pady=5)
-        
-        self.name_var = tk.StringVar()
-        ttk.Entry(main_frame, textvariable=self.name_var, width=40).pack(fill=tk.X, pady=5)
+        name_label = ttk.Label(main_frame, text="Nom de la recherche:")
+        self.name_var = tk.StringVar(value="")
+        name_entry = ttk.Entry(main_frame, textvariable=self.name_var, width=40)
         
         # Summary
-        ttk.Label(main_frame, text="Résumé:").pack(anchor=tk.W, pady=(15, 5))
-        
-        summary_text = f"Requête: '{self.query}'\n"
-        summary_text += f"Filtres: {len(self.filters)} actif(s)"
-        
-        summary_label = ttk.Label(main_frame, text=summary_text, 
-                                 background="#f5f5f5", padding=10)
-        summary_label.pack(fill=tk.X, pady=5)
+        summary_title = ttk.Label(main_frame, text="Résumé:")
+        self.summary_label = ttk.Label(main_frame, text=self.summary_text(), 
+                                      style='Summary.TLabel')
         
         # Buttons
         button_frame = ttk.Frame(main_frame)
+        
+        buttons = [
+            ttk.Button(button_frame, text=_LBL_SAVE, command=self.save_search, takefocus=0),
+            ttk.Button(button_frame, text=_LBL_CANCEL, command=self.close, takefocus=0)
+        ]
+        for column, button in enumerate(buttons):
+            button.grid(row=0, column=column, padx=5)
+        
+        # Buttons are out of the tab order, keep them reachable from the keyboard
+        self.dialog.bind('<Return>', lambda e: self.save_search())
+        self.dialog.bind('<Escape>', lambda e: self.close())
+        
+        # Lay out everything in one pass
+        name_label.pack(anchor=tk.W, pady=5)
+        name_entry.pack(fill=tk.X, pady=5)
+        summary_title.pack(anchor=tk.W, pady=(15, 5))
+        self.summary_label.pack(fill=tk.X, pady=5)
         button_frame.pack(pady=20)
         
-        ttk.Button(button_frame, text="Sauvegarder", 
-                  command=self.save_search).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Annuler", 
-                  command=self.dialog.destroy).pack(side=tk.LEFT, padx=5)
+        # Single layout pass
+        main_frame.update_idletasks()
+    
+    def summary_text(self) -> str:
+        """Summary of the search being saved"""
+        return f"Requête: '{self.query}'\nFiltres: {len(self.filters)} actif(s)"
     
     def save_search(self):
         """Save the search configuration"""
-        name = self.name_var.get().strip()
+        raw_name = self.name_var.get()
         
-        if not name:
-            tk.messagebox.showwarning("Attention", "Veuillez saisir un nom")
+        if not _NAME_RE.search(raw_name):
+            messagebox.showwarning(_TITLE_WARNING, _MSG_NAME_REQUIRED)
             return
         
-        # Create saved search
-        saved_search = SavedSearch(
-            name=name,
-            query=self.query,
-            filters=self.filters
-        )
+        name = raw_name.strip()
+        
+        # Create saved search (replaces any search of the same name)
+        saved_search = SavedSearch(name=name, query=self.query, filters=tuple(self.filters))
         
         # Callback
         self.callback(saved_search)
         
         # Close dialog
-        self.dialog.destroy()
\ No newline at end of file
+        self.close()
+    
+    def close(self):
+        """Hide the dialog, keeping its widgets for the next use"""
+        self.dialog.grab_release()
+        self.dialog.withdraw()
\ No newline at end of file
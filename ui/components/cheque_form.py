@@ -6,13 +6,135 @@ Formulaire de saisie de chèques
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from tkcalendar import DateEntry
+from tkcalendar import Calendar
 from datetime import datetime, date
+from collections import OrderedDict
 import os
+import re
+import subprocess
+import sys
+
+
+# Options du calendrier partagé, résolues une seule fois
+_CALENDAR_OPTIONS = {
+    'background': 'darkblue', 'foreground': 'white',
+    'borderwidth': 2, 'date_pattern': 'dd/mm/yyyy',
+}
+
+# Valeurs des listes déroulantes, partagées par toutes les instances
+_STATUS_VALUES = ('en_attente', 'encaisse', 'rejete', 'impaye', 'depose', 'annule')
+_STATUS_SET = frozenset(_STATUS_VALUES)
+_CURRENCY_VALUES = ('MAD', 'EUR', 'USD')
+
+# Montant : chiffres avec au plus un séparateur décimal ('.' ou ',')
+_AMOUNT_RE = re.compile(r'^\s*([0-9]+[.,]?[0-9]*)\s*$')
+
+# Saisie des dates : format jj/mm/aaaa, seuls chiffres et '/' acceptés à la frappe
+_DATE_FORMAT = '%d/%m/%Y'
+_DATE_CHARS_RE = re.compile(r'[0-9/]{0,10}')
+
+
+def _iso_date(d):
+    """Formate une date en AAAA-MM-JJ sans passer par strftime"""
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+
+class _CalendarPopup:
+    """Calendrier partagé par tous les champs de date, créé au premier usage"""
+    
+    _instance = None
+    
+    @classmethod
+    def open(cls, field):
+        """Affiche le calendrier pour le champ donné"""
+        # Recréé si la fenêtre qui le portait a été détruite
+        if cls._instance is None or not cls._instance.window.winfo_exists():
+            cls._instance = cls(field.winfo_toplevel())
+        cls._instance.show(field)
+    
+    def __init__(self, master):
+        self.field = None
+        self.window = tk.Toplevel(master)
+        self.window.withdraw()
+        self.window.title("Date")
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.calendar = Calendar(self.window, **_CALENDAR_OPTIONS)
+        self.calendar.pack(padx=5, pady=5)
+        self.calendar.bind('<<CalendarSelected>>', self.on_select)
+        self.window.bind('<Escape>', lambda e: self.close())
+    
+    def show(self, field):
+        """Positionne le calendrier sous le champ et le rend visible"""
+        self.field = field
+        try:
+            self.calendar.selection_set(field.get_date())
+        except ValueError:
+            pass
+        
+        self.window.geometry(f"+{field.winfo_rootx()}+{field.winfo_rooty() + field.winfo_height()}")
+        self.window.transient(field.winfo_toplevel())
+        self.window.deiconify()
+        self.window.lift()
+        self.calendar.focus_set()
+    
+    def on_select(self, event=None):
+        """Reporte la date choisie dans le champ"""
+        self.field.set_date(self.calendar.selection_get())
+        self.close()
+    
+    def close(self):
+        """Masque le calendrier (réutilisé au prochain appel)"""
+        self.window.withdraw()
+
+
+class _DateField(ttk.Frame):
+    """Champ de date léger : saisie jj/mm/aaaa et calendrier partagé à la demande"""
+    
+    def __init__(self, parent, width=12):
+        super().__init__(parent)
+        self.var = tk.StringVar()
+        
+        ttk.Entry(self, textvariable=self.var, width=width, validate='key',
+                  validatecommand=(self.register(self._validate), '%P')).pack(side=tk.LEFT)
+        ttk.Button(self, text="📅", width=3, takefocus=0,
+                   command=lambda: _CalendarPopup.open(self)).pack(side=tk.LEFT, padx=(2, 0))
+        
+        self.set_date(date.today())
+    
+    @staticmethod
+    def _validate(text):
+        """Accepte uniquement chiffres et '/' pendant la frappe"""
+        return _DATE_CHARS_RE.fullmatch(text) is not None
+    
+    def get(self):
+        """Retourne le texte saisi"""
+        return self.var.get().strip()
+    
+    def get_date(self):
+        """Retourne la date saisie (ValueError si invalide)"""
+        return datetime.strptime(self.get(), _DATE_FORMAT).date()
+    
+    def set_date(self, d):
+        """Affiche la date au format jj/mm/aaaa"""
+        self.var.set(f"{d.day:02d}/{d.month:02d}/{d.year:04d}")
+
 
 class ChequeFormFrame(ttk.Frame):
     """Frame pour le formulaire de saisie de chèques"""
     
+    # Délai d'attente avant la recherche (ms), longueur min, nombre max de suggestions
+    # et de recherches gardées en cache
+    SEARCH_DELAY = 150
+    SEARCH_MIN_LENGTH = 3
+    SEARCH_LIMIT = 20
+    SEARCH_CACHE_SIZE = 256
+    
+    # Délai avant la vérification des doublons (ms) et taille max du cache
+    DUP_CHECK_DELAY = 250
+    DUP_CACHE_SIZE = 256
+    
     def __init__(self, parent, db_manager, current_user):
         super().__init__(parent)
         self.db = db_manager
@@ -21,11 +143,8 @@ class ChequeFormFrame(ttk.Frame):
         # Variables du formulaire
         self.init_variables()
         
-        # Interface utilisateur
+        # Interface utilisateur (les données sont chargées après la dernière section)
         self.setup_ui()
-        
-        # Chargement des données
-        self.load_form_data()
     
     def init_variables(self):
         """Initialise les variables du formulaire"""
@@ -47,32 +166,50 @@ class ChequeFormFrame(ttk.Frame):
         self.client_address_var = tk.StringVar()
         self.client_phone_var = tk.StringVar()
         self.client_email_var = tk.StringVar()
+        self.client_search_var = tk.StringVar()
+        
+        # Scan du chèque
+        self.scan_path_var = tk.StringVar()
+        
+        # Valeurs par défaut appliquées par clear_form
+        self._clearable = (
+            (self.amount_var, ""), (self.currency_var, "MAD"),
+            (self.cheque_number_var, ""), (self.depositor_name_var, ""),
+            (self.invoice_number_var, ""), (self.notes_var, ""),
+            (self.client_var, ""), (self.branch_var, ""),
+            (self.status_var, "en_attente"), (self.scan_path_var, ""),
+            (self.client_type_var, "personne"), (self.client_name_var, ""),
+            (self.client_id_number_var, ""), (self.client_vat_number_var, ""),
+            (self.client_address_var, ""), (self.client_phone_var, ""),
+            (self.client_email_var, ""), (self.client_search_var, ""),
+        )
+        self._clearing = False
         
-        # Données de référence
-        self.clients_data = []
+        # Données de référence (les clients sont recherchés à la demande)
         self.branches_data = []
         self.banks_data = []
-    
-    def setup_ui(self):
-        """Configure l'interface utilisateur"""
-        # Conteneur principal avec scrollbar
-        main_canvas = tk.Canvas(self)
-        scrollbar = ttk.Scrollbar(self, orient="vertical", command=main_canvas.yview)
-        scrollable_frame = ttk.Frame(main_canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: main_canvas.configure(scrollregion=main_canvas.bbox("all"))
-        )
+        self.branch_index = {}
+        
+        # Recherche client différée et mise en cache
+        self._search_after_id = None
+        self._search_cache = OrderedDict()
+        self._current_suggestions = []
         
-        main_canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        main_canvas.configure(yscrollcommand=scrollbar.set)
+        # Vérification des doublons différée, résultats par (numéro, agence)
+        self._dup_after_id = None
+        self._dup_cache = OrderedDict()
         
-        main_canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # Montant validé (voir validate_form)
+        self._parsed_amount = None
         
+        # Toute modification du numéro ou de l'agence relance la vérification
+        self.cheque_number_var.trace_add('write', self._schedule_dup_check)
+        self.branch_var.trace_add('write', self._schedule_dup_check)
+    
+    def setup_ui(self):
+        """Configure l'interface utilisateur"""
         # Titre
-        title_frame = ttk.Frame(scrollable_frame)
+        title_frame = ttk.Frame(self)
         title_frame.pack(fill=tk.X, padx=20, pady=10)
         
         ttk.Label(title_frame, text="➕ Nouveau Chèque", 
@@ -83,20 +220,37 @@ class ChequeFormFrame(ttk.Frame):
         ttk.Button(title_frame, text="💾 Enregistrer", 
                   command=self.save_cheque).pack(side=tk.RIGHT)
         
-        # Section informations du chèque
-        self.create_cheque_section(scrollable_frame)
-        
-        # Section client
-        self.create_client_section(scrollable_frame)
-        
-        # Section banque et agence
-        self.create_bank_section(scrollable_frame)
-        
-        # Section complémentaire
-        self.create_additional_section(scrollable_frame)
+        # Notebook : un onglet par section, seul l'onglet visible est affiché
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        # Onglet informations du chèque
+        cheque_tab = ttk.Frame(self.notebook)
+        self.notebook.add(cheque_tab, text="📋 Chèque")
+        self.create_cheque_section(cheque_tab)
+        
+        # Onglets client, banque, complémentaire et scan : construits après
+        # le premier affichage, un par cycle d'inactivité
+        pending = []
+        for builder, text in ((self.create_client_section, "👤 Client"),
+                              (self.create_bank_section, "🏦 Banque"),
+                              (self.create_additional_section, "📄 Complémentaire"),
+                              (self.create_scan_section, "📷 Scan")):
+            tab = ttk.Frame(self.notebook)
+            self.notebook.add(tab, text=text)
+            pending.append((builder, tab))
+        
+        self.after_idle(self._build_next_section, pending)
+    
+    def _build_next_section(self, pending):
+        """Construit le prochain onglet différé, puis charge les données"""
+        builder, parent = pending.pop(0)
+        builder(parent)
         
-        # Section scan
-        self.create_scan_section(scrollable_frame)
+        if pending:
+            self.after_idle(self._build_next_section, pending)
+        else:
+            self.load_form_data()
     
     def create_cheque_section(self, parent):
         """Crée la section des informations du chèque"""
@@ -108,9 +262,7 @@ class ChequeFormFrame(ttk.Frame):
         row1.pack(fill=tk.X, pady=5)
         
         ttk.Label(row1, text="N° Chèque *:").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
-        cheque_entry = ttk.Entry(row1, textvariable=self.cheque_number_var, width=20)
-        cheque_entry.grid(row=0, column=1, sticky=tk.W, padx=(0, 30))
-        cheque_entry.bind('<FocusOut>', self.check_duplicate)
+        ttk.Entry(row1, textvariable=self.cheque_number_var, width=20).grid(row=0, column=1, sticky=tk.W, padx=(0, 30))
         
         ttk.Label(row1, text="Montant *:").grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
         amount_frame = ttk.Frame(row1)
@@ -118,20 +270,18 @@ class ChequeFormFrame(ttk.Frame):
         
         ttk.Entry(amount_frame, textvariable=self.amount_var, width=15).pack(side=tk.LEFT)
         ttk.Combobox(amount_frame, textvariable=self.currency_var, 
-                    values=["MAD", "EUR", "USD"], width=8, state="readonly").pack(side=tk.LEFT, padx=(5, 0))
+                    values=_CURRENCY_VALUES, width=8, state="readonly").pack(side=tk.LEFT, padx=(5, 0))
         
         # Ligne 2: Dates
         row2 = ttk.Frame(section)
         row2.pack(fill=tk.X, pady=5)
         
         ttk.Label(row2, text="Date d'émission *:").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
-        self.issue_date = DateEntry(row2, width=12, background='darkblue',
-                                   foreground='white', borderwidth=2, date_pattern='dd/mm/yyyy')
+        self.issue_date = _DateField(row2)
         self.issue_date.grid(row=0, column=1, sticky=tk.W, padx=(0, 30))
         
         ttk.Label(row2, text="Date d'échéance *:").grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
-        self.due_date = DateEntry(row2, width=12, background='darkblue',
-                                 foreground='white', borderwidth=2, date_pattern='dd/mm/yyyy')
+        self.due_date = _DateField(row2)
         self.due_date.grid(row=0, column=3, sticky=tk.W)
         
         # Ligne 3: Déposant et Statut
@@ -142,9 +292,8 @@ class ChequeFormFrame(ttk.Frame):
         ttk.Entry(row3, textvariable=self.depositor_name_var, width=25).grid(row=0, column=1, sticky=tk.W, padx=(0, 30))
         
         ttk.Label(row3, text="Statut:").grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
-        status_combo = ttk.Combobox(row3, textvariable=self.status_var, width=15, state="readonly")
-        status_combo['values'] = ['en_attente', 'encaisse', 'rejete', 'impaye', 'depose', 'annule']
-        status_combo.grid(row=0, column=3, sticky=tk.W)
+        ttk.Combobox(row3, textvariable=self.status_var, values=_STATUS_VALUES,
+                    width=15, state="readonly").grid(row=0, column=3, sticky=tk.W)
         
         # Indicateur de doublon
         self.duplicate_label = ttk.Label(section, text="", foreground="red")
@@ -170,7 +319,6 @@ class ChequeFormFrame(ttk.Frame):
         search_frame.pack(fill=tk.X, pady=5)
         
         ttk.Label(search_frame, text="Rechercher client:").pack(side=tk.LEFT)
-        self.client_search_var = tk.StringVar()
         search_entry = ttk.Entry(search_frame, textvariable=self.client_search_var, width=30)
         search_entry.pack(side=tk.LEFT, padx=(10, 0))
         search_entry.bind('<KeyRelease>', self.search_clients)
@@ -263,8 +411,7 @@ class ChequeFormFrame(ttk.Frame):
         ttk.Entry(row1, textvariable=self.invoice_number_var, width=20).grid(row=0, column=1, sticky=tk.W, padx=(0, 30))
         
         ttk.Label(row1, text="Date Facture:").grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
-        self.invoice_date = DateEntry(row1, width=12, background='darkblue',
-                                     foreground='white', borderwidth=2, date_pattern='dd/mm/yyyy')
+        self.invoice_date = _DateField(row1)
         self.invoice_date.grid(row=0, column=3, sticky=tk.W)
         
         # Ligne 2: Notes
@@ -272,15 +419,9 @@ class ChequeFormFrame(ttk.Frame):
         row2.pack(fill=tk.X, pady=5)
         
         ttk.Label(row2, text="Notes:").pack(anchor=tk.W)
-        notes_text = tk.Text(row2, height=3, width=60)
-        notes_text.pack(fill=tk.X, pady=5)
-        
-        # Lier le Text widget à la variable
-        def update_notes(*args):
-            self.notes_var.set(notes_text.get(1.0, tk.END).strip())
-        
-        notes_text.bind('<KeyRelease>', update_notes)
-        self.notes_text = notes_text
+        # Le contenu est lu une seule fois à l'enregistrement
+        self.notes_text = tk.Text(row2, height=3, width=60)
+        self.notes_text.pack(fill=tk.X, pady=5)
     
     def create_scan_section(self, parent):
         """Crée la section pour le scan du chèque"""
@@ -290,7 +431,6 @@ class ChequeFormFrame(ttk.Frame):
         scan_frame = ttk.Frame(section)
         scan_frame.pack(fill=tk.X)
         
-        self.scan_path_var = tk.StringVar()
         ttk.Entry(scan_frame, textvariable=self.scan_path_var, width=50, state="readonly").pack(side=tk.LEFT)
         
         ttk.Button(scan_frame, text="📁 Parcourir", 
@@ -303,19 +443,14 @@ class ChequeFormFrame(ttk.Frame):
     def load_form_data(self):
         """Charge les données nécessaires au formulaire"""
         try:
-            # Charger les clients
-            self.clients_data = self.db.get_clients()
-            
             # Charger les agences avec leurs banques
             self.branches_data = self.db.get_branches()
             
-            # Mettre à jour la combobox des agences
-            branch_options = []
-            for branch in self.branches_data:
-                option = f"{branch['bank_name']} - {branch['name']}"
-                branch_options.append(option)
+            # Mettre à jour la combobox des agences et l'index libellé -> ID
+            self.branch_index = {f"{branch['bank_name']} - {branch['name']}": branch['id']
+                                 for branch in self.branches_data}
             
-            self.branch_combo['values'] = branch_options
+            self.branch_combo['values'] = list(self.branch_index)
             
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors du chargement des données: {e}")
@@ -334,22 +469,53 @@ class ChequeFormFrame(ttk.Frame):
             self.client_vat_label.config(text="ICE:")
     
     def search_clients(self, event=None):
-        """Recherche des clients en temps réel"""
+        """Recherche des clients en temps réel (différée)"""
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        
         search_term = self.client_search_var.get()
         
-        if len(search_term) < 2:
+        if len(search_term) < self.SEARCH_MIN_LENGTH:
+            self._current_suggestions = []
             self.client_listbox.delete(0, tk.END)
             return
         
+        self._search_after_id = self.after(self.SEARCH_DELAY, self._do_search, search_term)
+    
+    def _do_search(self, search_term):
+        """Exécute la recherche, en réutilisant un préfixe déjà en cache"""
+        self._search_after_id = None
+        
         try:
-            clients = self.db.search_clients(search_term)
+            clients = self._search_cache.get(search_term)
+            if clients is None:
+                # Un résultat incomplet (tronqué par la limite) ne peut pas être filtré localement
+                prefix = max((key for key, rows in self._search_cache.items()
+                              if search_term.startswith(key) and len(rows) < self.SEARCH_LIMIT),
+                             key=len, default=None)
+                if prefix is not None:
+                    term = search_term.casefold()
+                    clients = [client for client in self._search_cache[prefix]
+                               if term in client['_searchblob']]
+                else:
+                    clients = self.db.search_clients(search_term, limit=self.SEARCH_LIMIT)
+                    clients = clients[:self.SEARCH_LIMIT]
+                    # Texte de recherche normalisé une fois par client
+                    for client in clients:
+                        client['_searchblob'] = f"{client['name']}\n{client['id_number'] or ''}".casefold()
+                self._search_cache[search_term] = clients
+                if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+            
+            items = [f"{c['name']} ({c['type']}){' - ' + c['id_number'] if c['id_number'] else ''}"
+                     for c in clients]
             
+            # Un seul appel Tcl pour toutes les suggestions, dans l'ordre de la liste
+            self._current_suggestions = clients
             self.client_listbox.delete(0, tk.END)
-            for client in clients:
-                display_text = f"{client['name']} ({client['type']})"
-                if client['id_number']:
-                    display_text += f" - {client['id_number']}"
-                self.client_listbox.insert(tk.END, display_text)
+            if items:
+                self.client_listbox.insert(tk.END, *items)
                 
         except Exception as e:
             print(f"Erreur lors de la recherche: {e}")
@@ -361,16 +527,8 @@ class ChequeFormFrame(ttk.Frame):
             return
         
         try:
-            # Récupérer le client sélectionné
-            selected_text = self.client_listbox.get(selection[0])
-            client_name = selected_text.split(' (')[0]
-            
-            # Trouver le client dans les données
-            selected_client = None
-            for client in self.clients_data:
-                if client['name'] == client_name:
-                    selected_client = client
-                    break
+            # Récupérer le client sélectionné par sa position dans la liste
+            selected_client = self._current_suggestions[selection[0]]
             
             if selected_client:
                 # Remplir les champs
@@ -387,6 +545,7 @@ class ChequeFormFrame(ttk.Frame):
                 
                 # Vider la recherche
                 self.client_search_var.set('')
+                self._current_suggestions = []
                 self.client_listbox.delete(0, tk.END)
                 
         except Exception as e:
@@ -398,27 +557,48 @@ class ChequeFormFrame(ttk.Frame):
             messagebox.showwarning("Attention", "Veuillez saisir le nom du client")
             return
         
+        client = {
+            'type': self.client_type_var.get(),
+            'name': self.client_name_var.get().strip(),
+            'id_number': self.client_id_number_var.get().strip() or None,
+            'vat_number': self.client_vat_number_var.get().strip() or None,
+            'address': self.client_address_var.get().strip() or None,
+            'phone': self.client_phone_var.get().strip() or None,
+            'email': self.client_email_var.get().strip() or None,
+        }
+        
         try:
-            client_id = self.db.add_client(
-                client_type=self.client_type_var.get(),
-                name=self.client_name_var.get().strip(),
-                id_number=self.client_id_number_var.get().strip() or None,
-                vat_number=self.client_vat_number_var.get().strip() or None,
-                address=self.client_address_var.get().strip() or None,
-                phone=self.client_phone_var.get().strip() or None,
-                email=self.client_email_var.get().strip() or None
+            client['id'] = self.db.add_client(
+                client_type=client['type'],
+                name=client['name'],
+                id_number=client['id_number'],
+                vat_number=client['vat_number'],
+                address=client['address'],
+                phone=client['phone'],
+                email=client['email']
             )
+            client['active'] = True
             
             messagebox.showinfo("Succès", "Client ajouté avec succès!")
             
-            # Recharger les données
-            self.load_form_data()
+            # Les résultats de recherche en cache ne contiennent pas le nouveau client
+            self._search_cache.clear()
             
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de l'ajout du client: {e}")
     
-    def check_duplicate(self, event=None):
+    def _schedule_dup_check(self, *args):
+        """Planifie la vérification des doublons de numéro de chèque"""
+        if self._clearing:
+            return
+        
+        if self._dup_after_id:
+            self.after_cancel(self._dup_after_id)
+        self._dup_after_id = self.after(self.DUP_CHECK_DELAY, self._do_check_duplicate)
+    
+    def _do_check_duplicate(self):
         """Vérifie les doublons de numéro de chèque"""
+        self._dup_after_id = None
         cheque_number = self.cheque_number_var.get().strip()
         branch_selection = self.branch_var.get()
         
@@ -428,13 +608,19 @@ class ChequeFormFrame(ttk.Frame):
         
         try:
             # Trouver l'ID de l'agence
-            branch_id = None
-            for branch in self.branches_data:
-                if f"{branch['bank_name']} - {branch['name']}" == branch_selection:
-                    branch_id = branch['id']
-                    break
+            branch_id = self.branch_index.get(branch_selection)
             
-            if branch_id and self.db.check_duplicate_cheque(cheque_number, branch_id):
+            is_duplicate = False
+            if branch_id:
+                key = (cheque_number, branch_id)
+                is_duplicate = self._dup_cache.get(key)
+                if is_duplicate is None:
+                    is_duplicate = self.db.check_duplicate_cheque(cheque_number, branch_id)
+                    self._dup_cache[key] = is_duplicate
+                    if len(self._dup_cache) > self.DUP_CACHE_SIZE:
+                        self._dup_cache.popitem(last=False)
+            
+            if is_duplicate:
                 self.duplicate_label.config(text="⚠️ Ce numéro de chèque existe déjà pour cette agence!")
             else:
                 self.duplicate_label.config(text="")
@@ -467,8 +653,9 @@ class ChequeFormFrame(ttk.Frame):
             # Ouvrir le fichier avec l'application par défaut
             if os.name == 'nt':  # Windows
                 os.startfile(scan_path)
-            elif os.name == 'posix':  # macOS et Linux
-                os.system(f'open "{scan_path}"')
+            elif os.name == 'posix':  # macOS et Linux, sans shell ni attente
+                opener = "open" if sys.platform == "darwin" else "xdg-open"
+                subprocess.Popen([opener, scan_path])
         except Exception as e:
             messagebox.showerror("Erreur", f"Impossible d'ouvrir le fichier: {e}")
     
@@ -482,92 +669,103 @@ class ChequeFormFrame(ttk.Frame):
         dialog = BankManagementDialog(self, self.db)
         self.wait_window(dialog.dialog)
         
-        # Recharger les données après modification
+        # Recharger les agences après modification
         self.load_form_data()
     
-    def validate_form(self):
-        """Valide le formulaire avant sauvegarde"""
+    def validate_form(self, issue_date, due_date):
+        """Valide le formulaire avant sauvegarde (dates déjà lues, None si invalides)"""
         errors = []
         
         # Champs obligatoires
         if not self.cheque_number_var.get().strip():
             errors.append("• Numéro de chèque requis")
         
-        if not self.amount_var.get().strip():
+        # Montant analysé une seule fois, réutilisé par save_cheque
+        self._parsed_amount = None
+        amount_text = self.amount_var.get()
+        if not amount_text.strip():
             errors.append("• Montant requis")
         else:
-            try:
-                amount = float(self.amount_var.get().replace(',', '.'))
-                if amount <= 0:
-                    errors.append("• Le montant doit être positif")
-            except ValueError:
+            match = _AMOUNT_RE.match(amount_text)
+            if not match:
                 errors.append("• Montant invalide")
+            else:
+                self._parsed_amount = float(match.group(1).replace(',', '.'))
+                if self._parsed_amount <= 0:
+                    errors.append("• Le montant doit être positif")
         
         if not self.branch_var.get():
             errors.append("• Agence de dépôt requise")
         
+        if self.status_var.get() not in _STATUS_SET:
+            errors.append("• Statut invalide")
+        
         # Dates
-        try:
-            issue_date = self.issue_date.get_date()
-            due_date = self.due_date.get_date()
-            
-            if due_date < issue_date:
-                errors.append("• La date d'échéance ne peut pas être antérieure à la date d'émission")
-        except:
+        if issue_date is None or due_date is None:
             errors.append("• Dates invalides")
+        elif due_date < issue_date:
+            errors.append("• La date d'échéance ne peut pas être antérieure à la date d'émission")
         
         return errors
     
     def save_cheque(self):
         """Sauvegarde le chèque"""
+        # Lire les dates une seule fois
+        try:
+            issue_date = self.issue_date.get_date()
+            due_date = self.due_date.get_date()
+        except Exception:
+            issue_date = due_date = None
+        
         # Validation
-        errors = self.validate_form()
+        errors = self.validate_form(issue_date, due_date)
         if errors:
             messagebox.showerror("Erreurs de validation", "\n".join(errors))
             return
         
         try:
             # Trouver l'ID de l'agence
-            branch_id = None
-            branch_selection = self.branch_var.get()
-            for branch in self.branches_data:
-                if f"{branch['bank_name']} - {branch['name']}" == branch_selection:
-                    branch_id = branch['id']
-                    break
+            branch_id = self.branch_index.get(self.branch_var.get())
             
-            # Ajouter le client s'il n'existe pas
-            client_id = None
-            if self.client_name_var.get().strip():
-                client_id = self.db.add_client(
-                    client_type=self.client_type_var.get(),
-                    name=self.client_name_var.get().strip(),
-                    id_number=self.client_id_number_var.get().strip() or None,
-                    vat_number=self.client_vat_number_var.get().strip() or None,
-                    address=self.client_address_var.get().strip() or None,
-                    phone=self.client_phone_var.get().strip() or None,
-                    email=self.client_email_var.get().strip() or None
-                )
+            invoice_date = self.invoice_date.get_date() if self.invoice_date.get() else None
             
             # Préparer les données du chèque
             cheque_data = {
-                'amount': float(self.amount_var.get().replace(',', '.')),
+                'amount': self._parsed_amount,
                 'currency': self.currency_var.get(),
-                'issue_date': self.issue_date.get_date().strftime('%Y-%m-%d'),
-                'due_date': self.due_date.get_date().strftime('%Y-%m-%d'),
-                'client_id': client_id,
+                'issue_date': _iso_date(issue_date),
+                'due_date': _iso_date(due_date),
+                'client_id': None,
                 'branch_id': branch_id,
                 'status': self.status_var.get(),
                 'cheque_number': self.cheque_number_var.get().strip(),
                 'depositor_name': self.depositor_name_var.get().strip() or None,
                 'invoice_number': self.invoice_number_var.get().strip() or None,
-                'invoice_date': self.invoice_date.get_date().strftime('%Y-%m-%d') if self.invoice_date.get() else None,
-                'notes': self.notes_var.get().strip() or None,
+                'invoice_date': _iso_date(invoice_date) if invoice_date else None,
+                'notes': self.notes_text.get(1.0, tk.END).strip() or None,
                 'scan_path': self.scan_path_var.get() or None,
                 'created_by': self.current_user['id']
             }
             
-            # Sauvegarder
-            cheque_id = self.db.add_cheque(cheque_data)
+            # Client et chèque dans une seule transaction : pas de client orphelin en cas d'échec
+            with self.db.transaction() as tx:
+                # Ajouter le client s'il n'existe pas
+                if self.client_name_var.get().strip():
+                    cheque_data['client_id'] = tx.add_client(
+                        client_type=self.client_type_var.get(),
+                        name=self.client_name_var.get().strip(),
+                        id_number=self.client_id_number_var.get().strip() or None,
+                        vat_number=self.client_vat_number_var.get().strip() or None,
+                        address=self.client_address_var.get().strip() or None,
+                        phone=self.client_phone_var.get().strip() or None,
+                        email=self.client_email_var.get().strip() or None
+                    )
+                
+                # Sauvegarder
+                cheque_id = tx.add_cheque(cheque_data)
+            
+            # Ce numéro est désormais pris pour cette agence
+            self._dup_cache.pop((cheque_data['cheque_number'], branch_id), None)
             
             messagebox.showinfo("Succès", f"Chèque enregistré avec succès!\nID: {cheque_id}")
             
@@ -579,27 +777,17 @@ class ChequeFormFrame(ttk.Frame):
     
     def clear_form(self):
         """Efface tous les champs du formulaire"""
-        # Variables principales
-        self.amount_var.set("")
-        self.currency_var.set("MAD")
-        self.cheque_number_var.set("")
-        self.depositor_name_var.set("")
-        self.invoice_number_var.set("")
-        self.notes_var.set("")
-        self.client_var.set("")
-        self.branch_var.set("")
-        self.status_var.set("en_attente")
-        self.scan_path_var.set("")
+        # Variables : une seule passe, sans relancer la vérification des doublons
+        self._clearing = True
+        try:
+            for var, default in self._clearable:
+                var.set(default)
+        finally:
+            self._clearing = False
         
-        # Variables client
-        self.client_type_var.set("personne")
-        self.client_name_var.set("")
-        self.client_id_number_var.set("")
-        self.client_vat_number_var.set("")
-        self.client_address_var.set("")
-        self.client_phone_var.set("")
-        self.client_email_var.set("")
-        self.client_search_var.set("")
+        if self._dup_after_id:
+            self.after_cancel(self._dup_after_id)
+            self._dup_after_id = None
         
         # Dates à aujourd'hui
         today = date.today()
@@ -609,6 +797,7 @@ class ChequeFormFrame(ttk.Frame):
         
         # Nettoyer les widgets
         self.notes_text.delete(1.0, tk.END)
+        self._current_suggestions = []
         self.client_listbox.delete(0, tk.END)
         self.duplicate_label.config(text="")
         
@@ -7,16 +7,57 @@ Composant liste des chèques avec filtres avancés
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, date, timedelta
-import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# Badges d'affichage des statuts
+_STATUS_BADGES = {
+    'en_attente': '⏳ En Attente',
+    'encaisse': '✅ Encaissé',
+    'rejete': '❌ Rejeté',
+    'impaye': '⚠️ Impayé',
+    'depose': '📤 Déposé',
+    'annule': '🚫 Annulé'
+}
+
+
+def _row_values(c):
+    """Valeurs affichées dans le tableau pour un chèque"""
+    return (
+        c['id'],
+        c['cheque_number'],
+        c.get('client_name', 'N/A'),
+        c.get('bank_name', 'N/A'),
+        f"{c['amount']:,.2f} {c['currency']}",
+        c['due_date'],
+        _STATUS_BADGES.get(c['status'], c['status']),
+        c.get('depositor_name', '')
+    )
+
 
 class ChequeListFrame(ttk.Frame):
     """Frame pour la liste et gestion des chèques"""
     
+    # Nombre de lignes insérées dans le tableau à chaque fois que le défilement
+    # approche de la fin (seules les lignes visibles ou proches sont créées)
+    RENDER_BATCH = 100
+    
+    # Nombre de chèques chargés par requête (pagination par clé due_date, id)
+    PAGE_SIZE = 200
+    
+    # Intervalle de vérification des requêtes en arrière-plan (ms)
+    POLL_INTERVAL = 30
+    
     def __init__(self, parent, db_manager, current_user):
         super().__init__(parent)
         self.db = db_manager
         self.current_user = current_user
         
+        # Accès base de données hors du thread Tk (un seul thread : requêtes en série,
+        # chaque méthode du gestionnaire ouvre sa propre connexion dans ce thread)
+        self._db_executor = ThreadPoolExecutor(max_workers=1)
+        self._filter_generation = 0
+        
         # Variables de filtrage
         self.init_filter_variables()
         
@@ -37,8 +78,20 @@ class ChequeListFrame(ttk.Frame):
         self.amount_max_var = tk.StringVar()
         
         # Données de référence
-        self.cheques_data = []
         self.filtered_data = []
+        self._by_id = {}
+        self._rendered_count = 0
+        self._render_pending = False
+        self._summary = {'count': 0, 'total': 0}
+        self._filters = {}
+        self._page_cursor = None
+        self._has_more = False
+        self._page_pending = False
+        self._apply_after_id = None
+        self._amount_min = None
+        self._amount_max = None
+        self._banks = []
+        self._bank_name_to_id = {}
     
     def setup_ui(self):
         """Configure l'interface utilisateur"""
@@ -86,18 +139,18 @@ class ChequeListFrame(ttk.Frame):
         ttk.Label(row1, text="Recherche:").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
         search_entry = ttk.Entry(row1, textvariable=self.search_var, width=25)
         search_entry.grid(row=0, column=1, sticky=tk.W, padx=(0, 30))
-        search_entry.bind('<KeyRelease>', self.on_search_change)
+        search_entry.bind('<KeyRelease>', self._schedule_apply)
         
         ttk.Label(row1, text="Statut:").grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
         status_combo = ttk.Combobox(row1, textvariable=self.status_filter_var, width=15, state="readonly")
         status_combo['values'] = ['Tous', 'en_attente', 'encaisse', 'rejete', 'impaye', 'depose', 'annule']
         status_combo.grid(row=0, column=3, sticky=tk.W, padx=(0, 30))
-        status_combo.bind('<<ComboboxSelected>>', self.apply_filters)
+        status_combo.bind('<<ComboboxSelected>>', self._schedule_apply)
         
         ttk.Label(row1, text="Banque:").grid(row=0, column=4, sticky=tk.W, padx=(0, 10))
         self.bank_combo = ttk.Combobox(row1, textvariable=self.bank_filter_var, width=20, state="readonly")
         self.bank_combo.grid(row=0, column=5, sticky=tk.W)
-        self.bank_combo.bind('<<ComboboxSelected>>', self.apply_filters)
+        self.bank_combo.bind('<<ComboboxSelected>>', self._schedule_apply)
         
         # Ligne 2: Filtres de dates et montants
         row2 = ttk.Frame(filters_frame)
@@ -108,30 +161,32 @@ class ChequeListFrame(ttk.Frame):
         self.date_from = DateEntry(row2, width=12, background='darkblue',
                                   foreground='white', borderwidth=2, date_pattern='dd/mm/yyyy')
         self.date_from.grid(row=0, column=1, sticky=tk.W, padx=(0, 20))
-        self.date_from.bind('<<DateEntrySelected>>', self.apply_filters)
+        self.date_from.bind('<<DateEntrySelected>>', self._schedule_apply)
         
         ttk.Label(row2, text="Au:").grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
         self.date_to = DateEntry(row2, width=12, background='darkblue',
                                 foreground='white', borderwidth=2, date_pattern='dd/mm/yyyy')
         self.date_to.grid(row=0, column=3, sticky=tk.W, padx=(0, 30))
-        self.date_to.bind('<<DateEntrySelected>>', self.apply_filters)
+        self.date_to.bind('<<DateEntrySelected>>', self._schedule_apply)
         
         ttk.Label(row2, text="Montant min:").grid(row=0, column=4, sticky=tk.W, padx=(0, 10))
         min_entry = ttk.Entry(row2, textvariable=self.amount_min_var, width=12)
         min_entry.grid(row=0, column=5, sticky=tk.W, padx=(0, 20))
-        min_entry.bind('<KeyRelease>', self.on_amount_change)
+        min_entry.bind('<FocusOut>', self._on_amount_commit)
+        min_entry.bind('<Return>', self._on_amount_commit)
         
         ttk.Label(row2, text="Montant max:").grid(row=0, column=6, sticky=tk.W, padx=(0, 10))
         max_entry = ttk.Entry(row2, textvariable=self.amount_max_var, width=12)
         max_entry.grid(row=0, column=7, sticky=tk.W)
-        max_entry.bind('<KeyRelease>', self.on_amount_change)
+        max_entry.bind('<FocusOut>', self._on_amount_commit)
+        max_entry.bind('<Return>', self._on_amount_commit)
         
         # Boutons de contrôle des filtres
         controls_frame = ttk.Frame(filters_frame)
         controls_frame.pack(fill=tk.X, pady=10)
         
         ttk.Button(controls_frame, text="🔍 Appliquer", 
-                  command=self.apply_filters).pack(side=tk.LEFT, padx=(0, 10))
+                  command=self._do_apply_filters).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(controls_frame, text="🗑️ Effacer", 
                   command=self.clear_filters).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(controls_frame, text="⚙️ Filtres Avancés", 
@@ -175,15 +230,15 @@ class ChequeListFrame(ttk.Frame):
         self.tree.column('Statut', width=100)
         self.tree.column('Déposant', width=150)
         
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(container, orient=tk.VERTICAL, command=self.tree.yview)
+        # Scrollbars (le défilement vertical déclenche l'insertion des lignes suivantes)
+        self.v_scrollbar = ttk.Scrollbar(container, orient=tk.VERTICAL, command=self.tree.yview)
         h_scrollbar = ttk.Scrollbar(container, orient=tk.HORIZONTAL, command=self.tree.xview)
         
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll, xscrollcommand=h_scrollbar.set)
         
         # Placement
         self.tree.grid(row=0, column=0, sticky='nsew')
-        v_scrollbar.grid(row=0, column=1, sticky='ns')
+        self.v_scrollbar.grid(row=0, column=1, sticky='ns')
         h_scrollbar.grid(row=1, column=0, sticky='ew')
         
         container.grid_rowconfigure(0, weight=1)
@@ -193,6 +248,17 @@ class ChequeListFrame(ttk.Frame):
         self.tree.bind('<Double-1>', self.on_double_click)
         self.tree.bind('<Button-3>', self.show_context_menu)
         self.tree.bind('<<TreeviewSelect>>', self.on_selection_change)
+        
+        # Menu contextuel (construit une seule fois, réutilisé à chaque clic droit)
+        self._context_menu = tk.Menu(self, tearoff=0)
+        self._context_menu.add_command(label="✏️ Modifier", command=self.edit_selected)
+        self._context_menu.add_command(label="📋 Dupliquer", command=self.duplicate_selected)
+        self._context_menu.add_separator()
+        self._context_menu.add_command(label="✅ Marquer encaissé", command=partial(self.change_status, 'encaisse'))
+        self._context_menu.add_command(label="❌ Marquer rejeté", command=partial(self.change_status, 'rejete'))
+        self._context_menu.add_command(label="⚠️ Marquer impayé", command=partial(self.change_status, 'impaye'))
+        self._context_menu.add_separator()
+        self._context_menu.add_command(label="🗑️ Supprimer", command=self.delete_selected)
     
     def create_actions_bar(self):
         """Crée la barre d'actions"""
@@ -223,28 +289,76 @@ class ChequeListFrame(ttk.Frame):
         
         for text, status, color in status_buttons:
             btn = ttk.Button(actions_frame, text=text, 
-                           command=lambda s=status: self.change_status(s))
+                           command=partial(self.change_status, status))
             btn.pack(side=tk.LEFT, padx=2)
     
+    def destroy(self):
+        """Arrête le thread de travail avec le widget"""
+        self._db_executor.shutdown(wait=False)
+        super().destroy()
+    
+    def _submit(self, task, on_done, error_message):
+        """Exécute une tâche base de données en arrière-plan, puis on_done dans la boucle Tk"""
+        future = self._db_executor.submit(task)
+        self.after(self.POLL_INTERVAL, self._poll_future, future, on_done, error_message)
+    
+    def _poll_future(self, future, on_done, error_message):
+        """Attend la fin d'une tâche sans bloquer l'interface"""
+        if not future.done():
+            self.after(self.POLL_INTERVAL, self._poll_future, future, on_done, error_message)
+            return
+        
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("Erreur", f"{error_message}: {e}")
+            return
+        
+        on_done(result)
+    
     def load_data(self):
         """Charge les données initiales"""
+        # Banques et première page dans la même tâche d'arrière-plan
+        self._do_apply_filters(reload_banks=True)
+    
+    def _set_banks(self, banks):
+        """Met à jour les banques du filtre (conservées jusqu'à la prochaine actualisation)"""
+        self._banks = banks
+        self._bank_name_to_id = {bank['name']: bank['id'] for bank in self._banks}
+        self.bank_combo['values'] = ['Toutes'] + list(self._bank_name_to_id)
+    
+    def _schedule_apply(self, event=None, delay=150):
+        """Planifie l'application des filtres (les changements rapprochés n'en déclenchent qu'une)"""
+        if self._apply_after_id:
+            self.after_cancel(self._apply_after_id)
+        self._apply_after_id = self.after(delay, self._do_apply_filters)
+    
+    @staticmethod
+    def _parse_amount(text):
+        """Convertit une saisie de montant en float (None si vide ou invalide)"""
+        text = text.strip().replace(',', '.')
+        if not text:
+            return None
         try:
-            # Charger tous les chèques
-            self.cheques_data = self.db.get_cheques()
-            
-            # Charger les banques pour le filtre
-            banks = self.db.get_banks()
-            bank_names = ['Toutes'] + [bank['name'] for bank in banks]
-            self.bank_combo['values'] = bank_names
-            
-            # Appliquer les filtres initiaux
-            self.apply_filters()
-            
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors du chargement: {e}")
+            return float(text)
+        except ValueError:
+            return None
     
-    def apply_filters(self, event=None):
-        """Applique les filtres aux données"""
+    def _on_amount_commit(self, event=None):
+        """Valide les montants saisis (perte de focus ou Entrée) et relance le filtrage"""
+        amounts = (self._parse_amount(self.amount_min_var.get()),
+                   self._parse_amount(self.amount_max_var.get()))
+        if amounts != (self._amount_min, self._amount_max):
+            self._amount_min, self._amount_max = amounts
+            self._schedule_apply()
+    
+    def _do_apply_filters(self, event=None, reload_banks=False):
+        """Applique les filtres aux données (et recharge les banques si demandé)"""
+        # Un appel direct remplace l'application planifiée
+        if self._apply_after_id:
+            self.after_cancel(self._apply_after_id)
+            self._apply_after_id = None
+        
         try:
             # Construire les filtres
             filters = {}
@@ -254,13 +368,9 @@ class ChequeListFrame(ttk.Frame):
                 filters['status'] = self.status_filter_var.get()
             
             # Filtre par banque
-            if self.bank_filter_var.get() != "Toutes":
-                # Trouver l'ID de la banque
-                banks = self.db.get_banks()
-                for bank in banks:
-                    if bank['name'] == self.bank_filter_var.get():
-                        filters['bank_id'] = bank['id']
-                        break
+            bank_id = self._bank_name_to_id.get(self.bank_filter_var.get())
+            if bank_id is not None:
+                filters['bank_id'] = bank_id
             
             # Filtres de dates
             try:
@@ -271,96 +381,144 @@ class ChequeListFrame(ttk.Frame):
             except:
                 pass
             
-            # Filtres de montants
-            try:
-                if self.amount_min_var.get():
-                    filters['amount_min'] = float(self.amount_min_var.get().replace(',', '.'))
-                if self.amount_max_var.get():
-                    filters['amount_max'] = float(self.amount_max_var.get().replace(',', '.'))
-            except ValueError:
-                pass
-            
-            # Récupérer les données filtrées
-            self.filtered_data = self.db.get_cheques(filters)
+            # Filtres de montants (relus ici : le bouton Appliquer ne prend pas
+            # le focus, la saisie n'a donc pas forcément été validée)
+            self._amount_min = self._parse_amount(self.amount_min_var.get())
+            self._amount_max = self._parse_amount(self.amount_max_var.get())
+            if self._amount_min is not None:
+                filters['amount_min'] = self._amount_min
+            if self._amount_max is not None:
+                filters['amount_max'] = self._amount_max
             
-            # Appliquer le filtre de recherche textuelle
-            if self.search_var.get():
-                search_term = self.search_var.get().lower()
-                self.filtered_data = [
-                    cheque for cheque in self.filtered_data
-                    if (search_term in (cheque.get('cheque_number', '') or '').lower() or
-                        search_term in (cheque.get('client_name', '') or '').lower() or
-                        search_term in (cheque.get('depositor_name', '') or '').lower() or
-                        search_term in (cheque.get('bank_name', '') or '').lower())
-                ]
+            # Recherche textuelle (appliquée par la requête SQL)
+            search_term = self.search_var.get().strip()
+            if search_term:
+                filters['search'] = search_term
             
-            # Mettre à jour l'affichage
-            self.update_table()
+            # Récupérer la première page et la synthèse (calculée par SQLite)
+            # en arrière-plan ; seul le résultat de la dernière demande est affiché
+            self._filter_generation += 1
+            generation = self._filter_generation
+            self._filters = filters
+            self._submit(
+                lambda: (self.db.get_banks() if reload_banks else None,
+                         self.db.get_cheques(filters, limit=self.PAGE_SIZE),
+                         self.db.get_cheques_summary(filters)),
+                lambda result: self._render_results(result, generation),
+                "Erreur lors du filtrage"
+            )
             
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors du filtrage: {e}")
     
+    def _render_results(self, result, generation):
+        """Affiche le résultat d'un filtrage s'il n'a pas été remplacé entre-temps"""
+        banks, page, summary = result
+        if banks is not None:
+            self._set_banks(banks)
+        
+        if generation != self._filter_generation:
+            return
+        
+        self.filtered_data, self._summary = page, summary
+        self._by_id = {cheque['id']: cheque for cheque in self.filtered_data}
+        self._set_page_cursor(self.filtered_data)
+        self._page_pending = False
+        
+        # Mettre à jour l'affichage
+        self.update_table()
+    
     def update_table(self):
         """Met à jour l'affichage du tableau"""
-        # Vider le tableau
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Ajouter les données filtrées
-        total_amount = 0
-        for cheque in self.filtered_data:
-            # Formatage des données
-            amount_str = f"{cheque['amount']:,.2f} {cheque['currency']}"
-            total_amount += cheque['amount']
-            
-            # Badge de statut
-            status_badges = {
-                'en_attente': '⏳ En Attente',
-                'encaisse': '✅ Encaissé',
-                'rejete': '❌ Rejeté',
-                'impaye': '⚠️ Impayé',
-                'depose': '📤 Déposé',
-                'annule': '🚫 Annulé'
-            }
-            status_display = status_badges.get(cheque['status'], cheque['status'])
-            
-            # Insérer la ligne
-            item = self.tree.insert('', tk.END, values=(
-                cheque['id'],
-                cheque['cheque_number'],
-                cheque.get('client_name', 'N/A'),
-                cheque.get('bank_name', 'N/A'),
-                amount_str,
-                cheque['due_date'],
-                status_display,
-                cheque.get('depositor_name', '')
-            ))
-            
-            # Coloration selon le statut
-            if cheque['status'] == 'rejete':
-                self.tree.set(item, 'Statut', '❌ Rejeté')
-            elif cheque['status'] == 'encaisse':
-                self.tree.set(item, 'Statut', '✅ Encaissé')
-            elif cheque['status'] == 'impaye':
-                self.tree.set(item, 'Statut', '⚠️ Impayé')
+        # Vider le tableau (un seul appel)
+        self.tree.delete(*self.tree.get_children())
+        
+        # Seul le premier lot est inséré, la suite l'est au défilement
+        self._rendered_count = 0
+        self.render_more_rows()
         
         # Mettre à jour les informations
-        count = len(self.filtered_data)
+        self.show_summary()
+    
+    def show_summary(self):
+        """Affiche le nombre et le total des chèques filtrés"""
         self.results_info_var.set(
-            f"📊 {count} chèque(s) | Total: {total_amount:,.2f} MAD"
+            f"📊 {self._summary['count']} chèque(s) | Total: {self._summary['total']:,.2f} MAD"
         )
     
-    def on_search_change(self, event=None):
-        """Gère les changements de recherche avec délai"""
-        if hasattr(self, '_search_timer'):
-            self.after_cancel(self._search_timer)
-        self._search_timer = self.after(500, self.apply_filters)
+    def adjust_summary(self, count_delta, amount_delta):
+        """Met à jour la synthèse après une modification locale, sans requête"""
+        self._summary = {'count': self._summary['count'] + count_delta,
+                         'total': self._summary['total'] + amount_delta}
+        self.show_summary()
+    
+    def render_more_rows(self):
+        """Insère le lot de lignes suivant (l'iid est l'ID du chèque)"""
+        self._render_pending = False
+        start = self._rendered_count
+        end = min(start + self.RENDER_BATCH, len(self.filtered_data))
+        
+        # Lignes formatées en une passe, puis insertion (méthode résolue une seule fois)
+        rows = [(str(c['id']), _row_values(c)) for c in self.filtered_data[start:end]]
+        insert = self.tree.insert
+        for iid, values in rows:
+            insert('', tk.END, iid=iid, values=values)
+        
+        self._rendered_count = end
+    
+    def on_tree_scroll(self, first, last):
+        """Met à jour la scrollbar et insère la suite quand la fin approche"""
+        self.v_scrollbar.set(first, last)
+        
+        if float(last) <= 0.9:
+            return
+        
+        if self._rendered_count < len(self.filtered_data):
+            if not self._render_pending:
+                self._render_pending = True
+                self.after_idle(self.render_more_rows)
+        elif self._has_more and not self._page_pending:
+            self.load_next_page()
+    
+    def _matches_filters(self, cheque):
+        """Indique si un chèque modifié localement correspond encore aux filtres
+        (seul le statut change lors d'une modification locale)"""
+        status = self._filters.get('status')
+        return status is None or cheque['status'] == status
     
-    def on_amount_change(self, event=None):
-        """Gère les changements de montant avec délai"""
-        if hasattr(self, '_amount_timer'):
-            self.after_cancel(self._amount_timer)
-        self._amount_timer = self.after(1000, self.apply_filters)
+    def _remove_row(self, cheque):
+        """Retire un chèque de la liste et de la synthèse, sans recharger"""
+        self.tree.delete(str(cheque['id']))
+        self.filtered_data.remove(cheque)
+        del self._by_id[cheque['id']]
+        self._rendered_count -= 1
+        self.adjust_summary(-1, -cheque['amount'])
+    
+    def _set_page_cursor(self, page):
+        """Mémorise la position de reprise après une page reçue de la base"""
+        self._has_more = len(page) == self.PAGE_SIZE
+        if page:
+            self._page_cursor = (page[-1]['due_date'], page[-1]['id'])
+    
+    def load_next_page(self):
+        """Charge la page suivante des résultats filtrés"""
+        self._page_pending = True
+        generation = self._filter_generation
+        filters, cursor = self._filters, self._page_cursor
+        self._submit(lambda: self.db.get_cheques(filters, limit=self.PAGE_SIZE, after=cursor),
+                     lambda page: self._append_page(page, generation),
+                     "Erreur lors du chargement")
+    
+    def _append_page(self, page, generation):
+        """Ajoute une page aux résultats et affiche le lot suivant"""
+        if generation != self._filter_generation:
+            return
+        
+        self._page_pending = False
+        self._set_page_cursor(page)
+        self.filtered_data.extend(page)
+        self._by_id.update((cheque['id'], cheque) for cheque in page)
+        self.render_more_rows()
     
     def clear_filters(self):
         """Efface tous les filtres"""
@@ -369,13 +527,15 @@ class ChequeListFrame(ttk.Frame):
         self.bank_filter_var.set("Toutes")
         self.amount_min_var.set("")
         self.amount_max_var.set("")
+        self._amount_min = None
+        self._amount_max = None
         
         # Réinitialiser les dates
         self.date_from.set_date(None)
         self.date_to.set_date(None)
         
         # Réappliquer les filtres
-        self.apply_filters()
+        self._do_apply_filters()
     
     def focus_search(self):
         """Met le focus sur la recherche"""
@@ -412,20 +572,10 @@ class ChequeListFrame(ttk.Frame):
         
         self.tree.selection_set(item)
         
-        menu = tk.Menu(self, tearoff=0)
-        menu.add_command(label="✏️ Modifier", command=self.edit_selected)
-        menu.add_command(label="📋 Dupliquer", command=self.duplicate_selected)
-        menu.add_separator()
-        menu.add_command(label="✅ Marquer encaissé", command=lambda: self.change_status('encaisse'))
-        menu.add_command(label="❌ Marquer rejeté", command=lambda: self.change_status('rejete'))
-        menu.add_command(label="⚠️ Marquer impayé", command=lambda: self.change_status('impaye'))
-        menu.add_separator()
-        menu.add_command(label="🗑️ Supprimer", command=self.delete_selected)
-        
         try:
-            menu.tk_popup(event.x_root, event.y_root)
+            self._context_menu.tk_popup(event.x_root, event.y_root)
         finally:
-            menu.grab_release()
+            self._context_menu.grab_release()
     
     def get_selected_cheque(self):
         """Récupère le chèque sélectionné"""
@@ -433,15 +583,8 @@ class ChequeListFrame(ttk.Frame):
         if not selection:
             return None
         
-        item = self.tree.item(selection[0])
-        cheque_id = item['values'][0]
-        
-        # Trouver le chèque dans les données
-        for cheque in self.filtered_data:
-            if cheque['id'] == cheque_id:
-                return cheque
-        
-        return None
+        # L'iid de la ligne est l'ID du chèque
+        return self._by_id.get(int(selection[0]))
     
     def edit_selected(self):
         """Modifie le chèque sélectionné"""
@@ -465,20 +608,36 @@ class ChequeListFrame(ttk.Frame):
             return
         
         if messagebox.askyesno("Confirmer", "Dupliquer ce chèque?"):
-            try:
-                # Créer une copie avec un nouveau numéro
-                new_cheque = cheque.copy()
-                new_cheque.pop('id', None)
-                new_cheque['cheque_number'] = f"{cheque['cheque_number']}_COPY"
-                new_cheque['status'] = 'en_attente'
-                new_cheque['created_by'] = self.current_user['id']
-                
-                self.db.add_cheque(new_cheque)
-                messagebox.showinfo("Succès", "Chèque dupliqué avec succès")
-                self.refresh_data()
-                
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Erreur lors de la duplication: {e}")
+            # Créer une copie avec un nouveau numéro
+            new_cheque = cheque.copy()
+            new_cheque.pop('id', None)
+            new_cheque['cheque_number'] = f"{cheque['cheque_number']}_COPY"
+            new_cheque['status'] = 'en_attente'
+            new_cheque['created_by'] = self.current_user['id']
+            
+            self._submit(lambda: self.db.add_cheque(new_cheque),
+                         lambda new_id: self._on_cheque_duplicated(cheque, new_cheque, new_id),
+                         "Erreur lors de la duplication")
+    
+    def _on_cheque_duplicated(self, cheque, new_cheque, new_id):
+        """Insère la copie sous l'original, sans recharger la liste"""
+        messagebox.showinfo("Succès", "Chèque dupliqué avec succès")
+        new_cheque['id'] = new_id
+        
+        # Sauf si le filtre de statut l'exclut
+        if not self._matches_filters(new_cheque):
+            return
+        
+        try:
+            iid = str(cheque['id'])
+            self.filtered_data.insert(self.filtered_data.index(cheque) + 1, new_cheque)
+            self._by_id[new_cheque['id']] = new_cheque
+            self.tree.insert('', self.tree.index(iid) + 1, iid=str(new_cheque['id']),
+                             values=_row_values(new_cheque))
+            self._rendered_count += 1
+            self.adjust_summary(1, new_cheque['amount'])
+        except Exception:
+            self.refresh_data()
     
     def delete_selected(self):
         """Supprime le chèque sélectionné"""
@@ -489,17 +648,18 @@ class ChequeListFrame(ttk.Frame):
         
         if messagebox.askyesno("Confirmer", 
                               f"Supprimer définitivement le chèque n°{cheque['cheque_number']}?"):
-            try:
-                # Supprimer de la base de données
-                with sqlite3.connect(self.db.db_path) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM cheques WHERE id = ?", (cheque['id'],))
-                
-                messagebox.showinfo("Succès", "Chèque supprimé avec succès")
-                self.refresh_data()
-                
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Erreur lors de la suppression: {e}")
+            self._submit(lambda: self.db.delete_cheque(cheque['id']),
+                         lambda result: self._on_cheque_deleted(cheque),
+                         "Erreur lors de la suppression")
+    
+    def _on_cheque_deleted(self, cheque):
+        """Retire le chèque supprimé de la liste, sans la recharger"""
+        messagebox.showinfo("Succès", "Chèque supprimé avec succès")
+        
+        try:
+            self._remove_row(cheque)
+        except Exception:
+            self.refresh_data()
     
     def change_status(self, new_status):
         """Change le statut du chèque sélectionné"""
@@ -520,13 +680,23 @@ class ChequeListFrame(ttk.Frame):
         if messagebox.askyesno("Confirmer", 
                               f"Changer le statut du chèque n°{cheque['cheque_number']} "
                               f"vers '{status_names.get(new_status, new_status)}'?"):
-            try:
-                self.db.update_cheque_status(cheque['id'], new_status, self.current_user['id'])
-                messagebox.showinfo("Succès", "Statut mis à jour avec succès")
-                self.refresh_data()
-                
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Erreur lors de la mise à jour: {e}")
+            user_id = self.current_user['id']
+            self._submit(lambda: self.db.update_cheque_status(cheque['id'], new_status, user_id),
+                         lambda result: self._on_status_changed(cheque, new_status),
+                         "Erreur lors de la mise à jour")
+    
+    def _on_status_changed(self, cheque, new_status):
+        """Met à jour la ligne seulement, ou la retire si le filtre l'exclut"""
+        messagebox.showinfo("Succès", "Statut mis à jour avec succès")
+        
+        try:
+            cheque['status'] = new_status
+            if self._matches_filters(cheque):
+                self.tree.set(str(cheque['id']), 'Statut', _STATUS_BADGES.get(new_status, new_status))
+            else:
+                self._remove_row(cheque)
+        except Exception:
+            self.refresh_data()
     
     def export_selection(self):
         """Exporte la sélection ou tous les résultats"""
@@ -534,6 +704,17 @@ class ChequeListFrame(ttk.Frame):
             messagebox.showwarning("Attention", "Aucune donnée à exporter")
             return
         
+        # Seules les pages parcourues sont en mémoire : tout le résultat est lu
+        # en arrière-plan avant l'export
+        if self._has_more:
+            filters = self._filters
+            self._submit(lambda: self.db.get_cheques(filters), self._open_export_dialog,
+                         "Erreur lors de l'export")
+        else:
+            self._open_export_dialog(self.filtered_data)
+    
+    def _open_export_dialog(self, data):
+        """Ouvre la boîte d'export pour les chèques donnés"""
         from ..dialogs.export_dialog import ExportDialog
-        dialog = ExportDialog(self, self.filtered_data)
+        dialog = ExportDialog(self, data)
         self.wait_window(dialog.dialog)
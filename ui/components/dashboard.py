@@ -6,17 +6,87 @@ Composant tableau de bord
 
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
+import tkinter.font as tkfont
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from datetime import datetime, timedelta
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import logging
+import time
+
+# Ordre, libellés et couleurs des statuts dans le graphique
+_STATUS_ORDER = ('en_attente', 'encaisse', 'rejete', 'impaye', 'depose', 'annule')
+
+_STATUS_LABELS = {
+    'en_attente': 'En Attente',
+    'encaisse': 'Encaissé',
+    'rejete': 'Rejeté',
+    'impaye': 'Impayé',
+    'depose': 'Déposé',
+    'annule': 'Annulé'
+}
+
+_STATUS_COLORS = {
+    'en_attente': '#ffc107',
+    'encaisse': '#28a745',
+    'rejete': '#dc3545',
+    'impaye': '#fd7e14',
+    'depose': '#17a2b8',
+    'annule': '#6c757d'
+}
+
+
+@dataclass
+class DashboardSnapshot:
+    """Résultat des requêtes d'une actualisation du tableau de bord"""
+    stats: Dict
+    due_cheques: List[tuple]
+    notifications: List[tuple]
+
 
 class DashboardFrame(ttk.Frame):
     """Frame du tableau de bord avec statistiques et graphiques"""
     
+    # Durée de validité des résultats de requêtes en cache (secondes)
+    CACHE_TTL = 60
+    
+    # Intervalle de vérification des requêtes en arrière-plan (ms)
+    POLL_INTERVAL = 30
+    
+    # Nombre de requêtes exécutées en parallèle (une par source de données)
+    FETCH_WORKERS = 3
+    
+    # Longueur maximale (caractères) d'un message d'alerte affiché
+    ALERT_MESSAGE_CHARS = 80
+    
+    # Délai de regroupement des clics rapprochés sur Actualiser (ms)
+    REFRESH_DELAY = 250
+    
     def __init__(self, parent, db_manager, current_user):
         super().__init__(parent)
         self.db = db_manager
         self.current_user = current_user
+        self.logger = logging.getLogger(__name__)
+        
+        # Cache des requêtes : clé -> (horodatage, résultat)
+        self._cache = {}
+        
+        # Lignes affichées dans la liste des alertes : iid -> valeurs
+        self._alert_rows = {}
+        
+        # Données affichées par chaque graphique (pas de redessin si elles n'ont pas changé)
+        self._status_sig = None
+        self._temporal_sig = None
+        
+        # Actualisation planifiée (clics regroupés)
+        self._pending_refresh = None
+        self._pending_force = False
+        
+        # Les requêtes s'exécutent hors de la boucle Tk
+        self._db_executor = ThreadPoolExecutor(max_workers=self.FETCH_WORKERS)
+        self._refresh_generation = 0
         
         self.setup_ui()
         self.refresh_data()
@@ -30,8 +100,14 @@ class DashboardFrame(ttk.Frame):
         ttk.Label(title_frame, text="📊 Tableau de Bord", 
                  font=('Arial', 16, 'bold')).pack(side=tk.LEFT)
         
-        ttk.Button(title_frame, text="🔄 Actualiser", 
-                  command=self.refresh_data).pack(side=tk.RIGHT)
+        # Maj+clic : actualisation forcée, sans passer par le cache
+        refresh_button = ttk.Button(title_frame, text="🔄 Actualiser", 
+                                   command=self._schedule_refresh)
+        refresh_button.pack(side=tk.RIGHT)
+        refresh_button.bind('<Shift-Button-1>', lambda e: self._schedule_refresh(force=True))
+        
+        self.loading_label = ttk.Label(title_frame, text="")
+        self.loading_label.pack(side=tk.RIGHT, padx=10)
         
         # Zone des cartes statistiques
         self.create_stats_cards()
@@ -94,6 +170,38 @@ class DashboardFrame(ttk.Frame):
         
         self.temporal_chart_frame = ttk.Frame(temporal_frame)
         self.temporal_chart_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Figures créées une seule fois : l'actualisation ne change que leurs données
+        # (API objet de matplotlib : aucune figure enregistrée dans pyplot)
+        # Secteurs : résolution réduite, axes sur toute la figure (le cadre porte déjà le titre)
+        self._status_fig = Figure(figsize=(5, 3), dpi=72)
+        self._status_ax = self._status_fig.add_subplot(111)
+        self._status_ax.set_position([0, 0, 1, 1])
+        self._status_canvas = FigureCanvasTkAgg(self._status_fig, self.status_chart_frame)
+        self._status_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        self._temporal_fig = Figure(figsize=(6, 4))
+        self._temporal_ax1, self._temporal_ax2 = self._temporal_fig.subplots(2, 1, sharex=True)
+        
+        # Graphique du nombre de chèques
+        self._count_line, = self._temporal_ax1.plot([], [], marker='o', color='#007bff')
+        self._temporal_ax1.set_ylabel('Nombre de chèques')
+        self._temporal_ax1.set_title('Évolution sur 6 mois')
+        self._temporal_ax1.grid(True, alpha=0.3)
+        self._temporal_message = self._temporal_ax1.text(
+            0.5, 0.5, '', transform=self._temporal_ax1.transAxes, ha='center', va='center')
+        
+        # Graphique des montants
+        self._amount_line, = self._temporal_ax2.plot([], [], marker='s', color='#28a745')
+        self._temporal_ax2.set_ylabel('Montant (DH)')
+        self._temporal_ax2.set_xlabel('Mois')
+        self._temporal_ax2.grid(True, alpha=0.3)
+        
+        # Rotation des labels
+        self._temporal_ax2.tick_params(axis='x', rotation=45)
+        
+        self._temporal_canvas = FigureCanvasTkAgg(self._temporal_fig, self.temporal_chart_frame)
+        self._temporal_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
     
     def create_alerts_area(self):
         """Crée la zone des alertes"""
@@ -109,35 +217,97 @@ class DashboardFrame(ttk.Frame):
         self.alerts_tree.heading('Date', text='Date')
         
         self.alerts_tree.column('Type', width=100)
-        self.alerts_tree.column('Message', width=400)
+        # Largeur fixe calculée une fois pour ALERT_MESSAGE_CHARS caractères
+        tree_font = tkfont.Font(font=ttk.Style().lookup('Treeview', 'font') or 'TkDefaultFont')
+        self.alerts_tree.column('Message', width=tree_font.measure('x' * self.ALERT_MESSAGE_CHARS),
+                                stretch=False)
         self.alerts_tree.column('Date', width=150)
         
         self.alerts_tree.pack(fill=tk.X)
         
         # Scrollbar
-        alerts_scroll = ttk.Scrollbar(alerts_frame, orient=tk.VERTICAL, 
-                                     command=self.alerts_tree.yview)
-        alerts_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.alerts_tree.configure(yscrollcommand=alerts_scroll.set)
+        self.alerts_scroll = ttk.Scrollbar(alerts_frame, orient=tk.VERTICAL, 
+                                          command=self.alerts_tree.yview)
+        self.alerts_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.alerts_tree.configure(yscrollcommand=self.alerts_scroll.set)
+    
+    def _cached(self, key, fetch):
+        """Retourne le résultat en cache de fetch() s'il date de moins de CACHE_TTL"""
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry and now - entry[0] < self.CACHE_TTL:
+            return entry[1]
+        
+        result = fetch()
+        self._cache[key] = (now, result)
+        return result
+    
+    def destroy(self):
+        """Arrête le thread de travail avec le widget"""
+        self._db_executor.shutdown(wait=False)
+        super().destroy()
+    
+    def _schedule_refresh(self, force=False):
+        """Planifie une actualisation (les clics rapprochés n'en déclenchent qu'une)"""
+        self._pending_force = self._pending_force or force
+        if self._pending_refresh:
+            self.after_cancel(self._pending_refresh)
+        self._pending_refresh = self.after(self.REFRESH_DELAY, self._do_refresh)
+    
+    def _do_refresh(self):
+        """Exécute l'actualisation planifiée"""
+        force = self._pending_force
+        self._pending_refresh = None
+        self._pending_force = False
+        self.refresh_data(force=force)
     
-    def refresh_data(self):
+    def refresh_data(self, force=False):
         """Actualise toutes les données du tableau de bord"""
+        # Les requêtes s'exécutent en arrière-plan, l'affichage reste dans la boucle Tk
+        self.loading_label.config(text="⏳ Actualisation...")
+        if force:
+            self._cache.clear()
+        
+        self._refresh_generation += 1
+        self.after(self.POLL_INTERVAL, self._poll_refresh, self._fetch_all(), self._refresh_generation)
+    
+    def _fetch_all(self):
+        """Lance les requêtes du tableau de bord en parallèle (threads de travail, aucun appel Tk)"""
+        submit = self._db_executor.submit
+        return [
+            submit(self._cached, 'stats', self.db.get_dashboard_stats),
+            submit(self._cached, 'due_soon', lambda: self.db.get_cheques_due_soon_minimal(7)),  # 7 jours
+            submit(self._cached, 'notifications',
+                   lambda: self.db.get_notifications_minimal(self.current_user['id'], limit=5))
+        ]
+    
+    def _poll_refresh(self, futures, generation):
+        """Attend la fin des requêtes sans bloquer l'interface"""
+        if not all(future.done() for future in futures):
+            self.after(self.POLL_INTERVAL, self._poll_refresh, futures, generation)
+            return
+        
+        # Une actualisation plus récente remplace celle-ci
+        if generation != self._refresh_generation:
+            return
+        
+        self.loading_label.config(text="")
         try:
-            # Récupération des statistiques
-            stats = self.db.get_dashboard_stats()
-            
-            # Mise à jour des cartes
-            self.update_stats_cards(stats)
-            
-            # Mise à jour des graphiques
-            self.update_status_chart(stats)
-            self.update_temporal_chart()
-            
-            # Mise à jour des alertes
-            self.update_alerts()
-            
-        except Exception as e:
-            print(f"Erreur lors de l'actualisation du tableau de bord: {e}")
+            self._apply(DashboardSnapshot(*(future.result() for future in futures)))
+        except Exception:
+            self.logger.exception("Erreur lors de l'actualisation du tableau de bord")
+    
+    def _apply(self, snapshot):
+        """Met à jour l'affichage avec le résultat des requêtes"""
+        # Mise à jour des cartes
+        self.update_stats_cards(snapshot.stats)
+        
+        # Mise à jour des graphiques
+        self.update_status_chart(snapshot.stats)
+        self.update_temporal_chart(snapshot.stats)
+        
+        # Mise à jour des alertes
+        self.update_alerts(snapshot.due_cheques, snapshot.notifications)
     
     def update_stats_cards(self, stats):
         """Met à jour les cartes de statistiques"""
@@ -164,157 +334,118 @@ class DashboardFrame(ttk.Frame):
     
     def update_status_chart(self, stats):
         """Met à jour le graphique des statuts"""
-        # Nettoyer le frame précédent
-        for widget in self.status_chart_frame.winfo_children():
-            widget.destroy()
-        
-        # Données pour le graphique
+        # Données pour le graphique, dans l'ordre fixe des statuts
         status_data = stats['by_status']
-        if not status_data:
-            ttk.Label(self.status_chart_frame, text="Aucune donnée disponible").pack()
+        rows = tuple((_STATUS_LABELS[status], status_data[status]['count'], _STATUS_COLORS[status])
+                     for status in _STATUS_ORDER
+                     if status_data.get(status, {}).get('count', 0) > 0)
+        if rows == self._status_sig:
             return
+        self._status_sig = rows
         
-        # Création du graphique en secteurs
-        fig, ax = plt.subplots(figsize=(6, 4))
-        
-        labels = []
-        sizes = []
-        colors = []
-        
-        status_colors = {
-            'en_attente': '#ffc107',
-            'encaisse': '#28a745',
-            'rejete': '#dc3545',
-            'impaye': '#fd7e14',
-            'depose': '#17a2b8',
-            'annule': '#6c757d'
-        }
-        
-        status_labels = {
-            'en_attente': 'En Attente',
-            'encaisse': 'Encaissé',
-            'rejete': 'Rejeté',
-            'impaye': 'Impayé',
-            'depose': 'Déposé',
-            'annule': 'Annulé'
-        }
-        
-        for status, data in status_data.items():
-            if data['count'] > 0:
-                labels.append(status_labels.get(status, status))
-                sizes.append(data['count'])
-                colors.append(status_colors.get(status, '#6c757d'))
+        labels, sizes, colors = zip(*rows) if rows else ((), (), ())
+        ax = self._status_ax
+        ax.clear()
         
         if sizes:
-            ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-            ax.set_title('Répartition par Statut')
-        
-        # Intégration dans Tkinter
-        canvas = FigureCanvasTkAgg(fig, self.status_chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        plt.close(fig)
+            ax.set_axis_on()
+            ax.pie(sizes, labels=labels, colors=colors, startangle=90,
+                   autopct=lambda p: f'{p:.0f}%' if p >= 1 else '',
+                   pctdistance=0.75, wedgeprops={'linewidth': 0})
+        else:
+            ax.set_axis_off()
+            ax.text(0.5, 0.5, 'Aucune donnée disponible', ha='center', va='center')
+        
+        self._status_canvas.draw_idle()
     
-    def update_temporal_chart(self):
+    def update_temporal_chart(self, stats):
         """Met à jour le graphique temporel"""
-        # Nettoyer le frame précédent
-        for widget in self.temporal_chart_frame.winfo_children():
-            widget.destroy()
+        # Données des 6 derniers mois
+        data = stats['temporal']
+        if data == self._temporal_sig:
+            return
+        self._temporal_sig = data
         
         try:
-            # Récupération des données des 6 derniers mois
-            import sqlite3
-            with sqlite3.connect(self.db.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        strftime('%Y-%m', due_date) as month,
-                        COUNT(*) as count,
-                        SUM(amount) as total
-                    FROM cheques 
-                    WHERE due_date >= date('now', '-6 months')
-                    GROUP BY strftime('%Y-%m', due_date)
-                    ORDER BY month
-                """)
-                
-                data = cursor.fetchall()
-            
-            if not data:
-                ttk.Label(self.temporal_chart_frame, text="Aucune donnée disponible").pack()
-                return
-            
-            # Création du graphique linéaire
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(6, 4), sharex=True)
-            
             months = [row[0] for row in data]
             counts = [row[1] for row in data]
             amounts = [row[2] for row in data]
             
-            # Graphique du nombre de chèques
-            ax1.plot(months, counts, marker='o', color='#007bff')
-            ax1.set_ylabel('Nombre de chèques')
-            ax1.set_title('Évolution sur 6 mois')
-            ax1.grid(True, alpha=0.3)
-            
-            # Graphique des montants
-            ax2.plot(months, amounts, marker='s', color='#28a745')
-            ax2.set_ylabel('Montant (DH)')
-            ax2.set_xlabel('Mois')
-            ax2.grid(True, alpha=0.3)
-            
-            # Rotation des labels
-            plt.xticks(rotation=45)
-            plt.tight_layout()
+            # Mois placés sur des positions entières, libellés en graduations
+            positions = range(len(months))
+            self._count_line.set_data(positions, counts)
+            self._amount_line.set_data(positions, amounts)
+            self._temporal_ax2.set_xticks(positions)
+            self._temporal_ax2.set_xticklabels(months)
             
-            # Intégration dans Tkinter
-            canvas = FigureCanvasTkAgg(fig, self.temporal_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            for ax in (self._temporal_ax1, self._temporal_ax2):
+                ax.relim()
+                ax.autoscale_view()
             
-            plt.close(fig)
+            self._temporal_message.set_text('' if data else 'Aucune donnée disponible')
+            self._temporal_fig.tight_layout()
             
         except Exception as e:
-            ttk.Label(self.temporal_chart_frame, 
-                     text=f"Erreur lors du chargement: {e}").pack()
+            self._temporal_sig = None
+            self._temporal_message.set_text(f"Erreur lors du chargement: {e}")
+        
+        self._temporal_canvas.draw_idle()
     
-    def update_alerts(self):
+    def update_alerts(self, due_cheques, notifications):
         """Met à jour la liste des alertes"""
-        # Nettoyer la liste
-        for item in self.alerts_tree.get_children():
-            self.alerts_tree.delete(item)
+        today = datetime.now().strftime('%Y-%m-%d')
         
+        # Lignes souhaitées, identifiées par une clé stable
+        desired = {}
         try:
             # Chèques arrivant à échéance
-            due_cheques = self.db.get_cheques_due_soon(7)  # 7 jours
-            
-            for cheque in due_cheques:
-                self.alerts_tree.insert('', tk.END, values=(
-                    '⏰ Échéance',
-                    f"Chèque n°{cheque['cheque_number']} - {cheque['client_name'] or 'Client inconnu'}",
-                    cheque['due_date']
-                ))
-            
-            # Notifications non lues
-            notifications = self.db.get_notifications(self.current_user['id'], unread_only=True)
+            for cheque_id, number, client, due_date in due_cheques:
+                desired[f"cheque-{cheque_id}"] = (
+                    '⏰ Échéance', f"Chèque n°{number} - {client}", due_date
+                )
             
-            for notif in notifications[:5]:  # Limiter à 5
-                self.alerts_tree.insert('', tk.END, values=(
-                    '🔔 Notification',
-                    notif['message'],
-                    notif['created_at'][:10]  # Date seulement
-                ))
+            # Notifications non lues (5 au plus, date seulement)
+            for notif_id, message, created in notifications:
+                if len(message) > self.ALERT_MESSAGE_CHARS:
+                    message = message[:self.ALERT_MESSAGE_CHARS] + '…'
+                desired[f"notif-{notif_id}"] = ('🔔 Notification', message, created)
             
             if not due_cheques and not notifications:
-                self.alerts_tree.insert('', tk.END, values=(
+                desired['info'] = (
                     '✅ Info',
                     'Aucune alerte en cours',
-                    datetime.now().strftime('%Y-%m-%d')
-                ))
+                    today
+                )
                 
         except Exception as e:
-            self.alerts_tree.insert('', tk.END, values=(
+            desired = {'error': (
                 '❌ Erreur',
                 f'Erreur lors du chargement des alertes: {e}',
-                datetime.now().strftime('%Y-%m-%d')
-            ))
+                today
+            )}
+        
+        # Comparaison ordonnée : un simple changement d'ordre doit aussi être affiché
+        if list(desired.items()) == list(self._alert_rows.items()):
+            return
+        
+        # Scrollbar détachée pendant les modifications, mise à jour une seule fois ensuite
+        self.alerts_tree.configure(yscrollcommand='')
+        
+        # Ne toucher qu'aux lignes qui ont changé (les lignes conservées sont
+        # replacées à leur rang dans la nouvelle liste triée)
+        for iid in [iid for iid in self._alert_rows if iid not in desired]:
+            self.alerts_tree.delete(iid)
+        
+        for index, (iid, values) in enumerate(desired.items()):
+            current = self._alert_rows.get(iid)
+            if current is None:
+                self.alerts_tree.insert('', index, iid=iid, values=values)
+                continue
+            if current != values:
+                self.alerts_tree.item(iid, values=values)
+            self.alerts_tree.move(iid, '', index)
+        
+        self._alert_rows = desired
+        
+        self.alerts_tree.configure(yscrollcommand=self.alerts_scroll.set)
+        self.alerts_scroll.set(*self.alerts_tree.yview())
@@ -13,12 +13,19 @@ import numpy as np
 from datetime import datetime, timedelta, date
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from analytics.advanced_analytics import AdvancedAnalytics, RiskLevel
 from automation.smart_automation import SmartAutomation
 
 class EnhancedDashboardFrame(ttk.Frame):
     """Enhanced dashboard with advanced analytics and real-time updates"""
     
+    # Polling interval for background refresh results (ms)
+    POLL_INTERVAL = 30
+    
+    # Number of panel fetches run concurrently
+    FETCH_WORKERS = 6
+    
     def __init__(self, parent, db_manager, current_user, config_manager):
         super().__init__(parent)
         self.db = db_manager
@@ -34,6 +41,20 @@ class EnhancedDashboardFrame(ttk.Frame):
         self.refresh_interval = 30  # seconds
         self.last_update = None
         
+        # Analytics results shared by the update_* methods of one refresh cycle
+        # (key -> Future, so concurrent fetches compute each result only once)
+        self._cycle_cache = {}
+        self._cycle_lock = threading.Lock()
+        
+        # Cheque data signature each panel was last drawn for (see refresh_dashboard_data)
+        self._panel_sigs = {}
+        
+        # Queries and analytics run off the Tk thread; one refresh at a time
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._fetch_pool = ThreadPoolExecutor(max_workers=self.FETCH_WORKERS)
+        self._refresh_inflight = False
+        self._refresh_pending = False  # manual refresh requested while one was running
+        
         # Setup UI
         self.setup_ui()
         
@@ -128,9 +149,42 @@ class EnhancedDashboardFrame(ttk.Frame):
         self.trend_chart_frame = ttk.Frame(trend_frame)
         self.trend_chart_frame.pack(fill=tk.BOTH, expand=True)
         
+        # Overview figures are built once; refreshes only update their data
+        self.create_overview_charts()
+        
         # Recent activity
         self.create_recent_activity(overview_frame)
     
+    def create_overview_charts(self):
+        """Create the persistent status and trend figures of the overview tab"""
+        self.status_fig = Figure(figsize=(5, 4))
+        self.status_ax = self.status_fig.add_subplot(111)
+        self.status_canvas = FigureCanvasTkAgg(self.status_fig, self.status_chart_frame)
+        self.status_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        self.trend_fig = Figure(figsize=(6, 4))
+        self.trend_ax1, self.trend_ax2 = self.trend_fig.subplots(2, 1, sharex=True)
+        
+        # Count trend
+        self.trend_line1, = self.trend_ax1.plot([], [], marker='o', color='#007bff', linewidth=2)
+        self.trend_ax1.set_ylabel('Nombre')
+        self.trend_ax1.set_title('Tendances (30 derniers jours)')
+        self.trend_ax1.grid(True, alpha=0.3)
+        self.trend_message = self.trend_ax1.text(
+            0.5, 0.5, '', transform=self.trend_ax1.transAxes, ha='center', va='center')
+        
+        # Amount trend
+        self.trend_line2, = self.trend_ax2.plot([], [], marker='s', color='#28a745', linewidth=2)
+        self.trend_ax2.set_ylabel('Montant (MAD)')
+        self.trend_ax2.set_xlabel('Date')
+        self.trend_ax2.grid(True, alpha=0.3)
+        
+        # Rotate x-axis labels
+        self.trend_ax2.tick_params(axis='x', rotation=45)
+        
+        self.trend_canvas = FigureCanvasTkAgg(self.trend_fig, self.trend_chart_frame)
+        self.trend_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
     def create_kpi_cards(self, parent):
         """Create KPI cards"""
         kpi_frame = ttk.Frame(parent)
@@ -385,26 +439,97 @@ class EnhancedDashboardFrame(ttk.Frame):
     
     def manual_refresh(self):
         """Manual refresh"""
+        # Run it as soon as the refresh already in flight completes
+        if self._refresh_inflight:
+            self._refresh_pending = True
+            self.status_var.set("Actualisation en attente...")
+            return
+        
         self.status_var.set("Actualisation en cours...")
+        # A manual refresh redraws every panel, even if the data looks unchanged
+        self._panel_sigs.clear()
         self.refresh_dashboard_data()
     
+    def _cached(self, key, fn):
+        """Return fn() computed at most once per refresh cycle"""
+        with self._cycle_lock:
+            future = self._cycle_cache.get(key)
+            owner = future is None
+            if owner:
+                future = self._cycle_cache[key] = Future()
+        
+        # The first caller computes the result, concurrent callers wait for it
+        if owner:
+            try:
+                future.set_result(fn())
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+    
+    def destroy(self):
+        """Stop the worker thread along with the widget"""
+        self._executor.shutdown(wait=False)
+        self._fetch_pool.shutdown(wait=False)
+        super().destroy()
+    
+    def _data_panels(self):
+        """(name, fetch, render) for each panel drawn from cheque data"""
+        return (
+            ('kpi', self._fetch_kpi_data, self.update_kpi_cards),
+            ('status', lambda: self._cached('dashboard_stats', self.db.get_dashboard_stats),
+             self.update_status_chart),
+            ('trend', self._fetch_trend_data, self.update_trend_chart),
+            ('aging', self.analytics.get_cheque_aging_analysis, self.update_aging_analysis),
+            ('seasonal', self.analytics.get_seasonal_trends, self.update_seasonal_trends),
+            ('risk', self._fetch_risk_data, self.update_risk_data),
+            ('performance', lambda: self._cached('performance_metrics', self.analytics.get_performance_metrics),
+             self.update_performance_metrics),
+        )
+    
     def refresh_dashboard_data(self):
         """Refresh all dashboard data"""
+        # Skip ticks that arrive while the previous refresh is still running
+        if self._refresh_inflight:
+            return
+        
+        self._refresh_inflight = True
+        future = self._executor.submit(self._fetch_dashboard_data, dict(self._panel_sigs))
+        self.after(self.POLL_INTERVAL, self._poll_refresh, future)
+    
+    def _fetch_dashboard_data(self, panel_sigs):
+        """Fetch the data of every stale panel (worker thread, no Tk calls)"""
+        # Each cycle starts from fresh analytics results
+        self._cycle_cache = {}
+        
+        # Data panels are only recomputed when cheques or clients changed since they were drawn;
+        # the stale ones are independent reads and are fetched concurrently
+        sig = self.db.get_cheques_signature()
+        futures = {panel: self._fetch_pool.submit(fetch)
+                   for panel, fetch, _ in self._data_panels()
+                   if panel_sigs.get(panel) != sig}
+        
+        results = {}
+        for panel, future in futures.items():
+            try:
+                results[panel] = future.result()
+            except Exception as e:
+                print(f"Error fetching {panel} data: {e}")
+        
+        return sig, results
+    
+    def _poll_refresh(self, future):
+        """Wait for the background fetch without blocking the UI, then render"""
+        if not future.done():
+            self.after(self.POLL_INTERVAL, self._poll_refresh, future)
+            return
+        
+        self._refresh_inflight = False
         try:
-            # Update KPI cards
-            self.update_kpi_cards()
-            
-            # Update charts
-            self.update_status_chart()
-            self.update_trend_chart()
-            self.update_aging_analysis()
-            self.update_seasonal_trends()
-            
-            # Update risk data
-            self.update_risk_data()
-            
-            # Update performance metrics
-            self.update_performance_metrics()
+            sig, results = future.result()
+            for panel, _, render in self._data_panels():
+                if panel in results:
+                    render(results[panel])
+                    self._panel_sigs[panel] = sig
             
             # Update automation status
             self.update_automation_status()
@@ -420,12 +545,24 @@ class EnhancedDashboardFrame(ttk.Frame):
         except Exception as e:
             self.status_var.set(f"Erreur: {str(e)}")
             messagebox.showerror("Erreur", f"Erreur lors de l'actualisation: {e}")
+        
+        # A manual refresh asked for during this one runs now
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self.manual_refresh()
+    
+    def _fetch_kpi_data(self):
+        """Fetch performance metrics, dashboard stats and risk profiles for the KPI cards"""
+        return (
+            self._cached('performance_metrics', self.analytics.get_performance_metrics),
+            self._cached('dashboard_stats', self.db.get_dashboard_stats),
+            self._cached('risk_profiles', self.analytics.calculate_client_risk_profiles)
+        )
     
-    def update_kpi_cards(self):
+    def update_kpi_cards(self, data):
         """Update KPI cards"""
         try:
-            # Get performance metrics
-            metrics = self.analytics.get_performance_metrics()
+            metrics, stats, risk_profiles = data
             overall = metrics.get('overall', {})
             
             # Update cards
@@ -445,14 +582,13 @@ class EnhancedDashboardFrame(ttk.Frame):
                 text=f"{overall.get('avg_processing_time', 0):.1f} jours"
             )
             
-            # Get pending count
-            pending_cheques = self.db.get_cheques({'status': 'en_attente'})
+            # Get pending count (from the per-status counts shared with the status chart)
+            pending_count = stats['by_status'].get('en_attente', {}).get('count', 0)
             self.kpi_cards['pending_count'].value_label.config(
-                text=str(len(pending_cheques))
+                text=str(pending_count)
             )
             
             # Get risk alerts count
-            risk_profiles = self.analytics.calculate_client_risk_profiles()
             high_risk_count = len([p for p in risk_profiles if p.risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]])
             self.kpi_cards['risk_alerts'].value_label.config(
                 text=str(high_risk_count)
@@ -461,24 +597,16 @@ class EnhancedDashboardFrame(ttk.Frame):
         except Exception as e:
             print(f"Error updating KPI cards: {e}")
     
-    def update_status_chart(self):
+    def update_status_chart(self, stats):
         """Update status distribution chart"""
         try:
-            # Clear previous chart
-            for widget in self.status_chart_frame.winfo_children():
-                widget.destroy()
+            # Redraw the pie on the persistent axes
+            ax = self.status_ax
+            ax.clear()
             
             # Get status data
-            stats = self.db.get_dashboard_stats()
             status_data = stats.get('by_status', {})
             
-            if not status_data:
-                ttk.Label(self.status_chart_frame, text="Aucune donnée disponible").pack()
-                return
-            
-            # Create pie chart
-            fig, ax = plt.subplots(figsize=(5, 4))
-            
             labels = []
             sizes = []
             colors = []
@@ -508,6 +636,7 @@ class EnhancedDashboardFrame(ttk.Frame):
                     colors.append(status_colors.get(status, '#6c757d'))
             
             if sizes:
+                ax.set_axis_on()
                 wedges, texts, autotexts = ax.pie(sizes, labels=labels, colors=colors, 
                                                  autopct='%1.1f%%', startangle=90)
                 ax.set_title('Répartition par Statut')
@@ -516,88 +645,68 @@ class EnhancedDashboardFrame(ttk.Frame):
                 for autotext in autotexts:
                     autotext.set_color('white')
                     autotext.set_fontweight('bold')
+            else:
+                ax.set_axis_off()
+                ax.text(0.5, 0.5, 'Aucune donnée disponible', ha='center', va='center')
             
-            # Integrate into Tkinter
-            canvas = FigureCanvasTkAgg(fig, self.status_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            plt.close(fig)
+            self.status_canvas.draw_idle()
             
         except Exception as e:
             print(f"Error updating status chart: {e}")
     
-    def update_trend_chart(self):
+    def _fetch_trend_data(self):
+        """Fetch daily cheque counts and amounts for the last 30 days"""
+        import sqlite3
+        with sqlite3.connect(self.db.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT 
+                    date(created_at) as date,
+                    COUNT(*) as count,
+                    SUM(amount) as total_amount
+                FROM cheques 
+                WHERE created_at >= date('now', '-30 days')
+                GROUP BY date(created_at)
+                ORDER BY date
+            """)
+            
+            return cursor.fetchall()
+    
+    def update_trend_chart(self, trend_data):
         """Update trend chart"""
         try:
-            # Clear previous chart
-            for widget in self.trend_chart_frame.winfo_children():
-                widget.destroy()
-            
-            # Get trend data
-            import sqlite3
-            with sqlite3.connect(self.db.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        date(created_at) as date,
-                        COUNT(*) as count,
-                        SUM(amount) as total_amount
-                    FROM cheques 
-                    WHERE created_at >= date('now', '-30 days')
-                    GROUP BY date(created_at)
-                    ORDER BY date
-                """)
-                
-                trend_data = cursor.fetchall()
-            
-            if not trend_data:
-                ttk.Label(self.trend_chart_frame, text="Aucune donnée disponible").pack()
-                return
-            
-            # Create line chart
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(6, 4), sharex=True)
-            
-            dates = [row[0] for row in trend_data]
-            counts = [row[1] for row in trend_data]
-            amounts = [row[2] for row in trend_data]
-            
-            # Count trend
-            ax1.plot(dates, counts, marker='o', color='#007bff', linewidth=2)
-            ax1.set_ylabel('Nombre')
-            ax1.set_title('Tendances (30 derniers jours)')
-            ax1.grid(True, alpha=0.3)
-            
-            # Amount trend
-            ax2.plot(dates, amounts, marker='s', color='#28a745', linewidth=2)
-            ax2.set_ylabel('Montant (MAD)')
-            ax2.set_xlabel('Date')
-            ax2.grid(True, alpha=0.3)
-            
-            # Rotate x-axis labels
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            
-            # Integrate into Tkinter
-            canvas = FigureCanvasTkAgg(fig, self.trend_chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            plt.close(fig)
+            # Columns (date, count, amount) sliced from one array; reshape keeps
+            # the 3 columns when there are no rows
+            arr = np.array(trend_data, dtype=object).reshape(-1, 3)
+            dates = arr[:, 0]
+            counts = arr[:, 1].astype(np.int64)
+            amounts = arr[:, 2].astype(np.float64)
+            
+            # Update the persistent lines; dates are placed on integer positions
+            positions = np.arange(len(dates))
+            self.trend_line1.set_data(positions, counts)
+            self.trend_line2.set_data(positions, amounts)
+            self.trend_ax2.set_xticks(positions)
+            self.trend_ax2.set_xticklabels(dates)
+            
+            for ax in (self.trend_ax1, self.trend_ax2):
+                ax.relim()
+                ax.autoscale_view()
+            
+            self.trend_message.set_text('' if trend_data else 'Aucune donnée disponible')
+            self.trend_fig.tight_layout()
+            self.trend_canvas.draw_idle()
             
         except Exception as e:
             print(f"Error updating trend chart: {e}")
     
-    def update_aging_analysis(self):
+    def update_aging_analysis(self, aging_data):
         """Update aging analysis chart"""
         try:
             # Clear previous chart
             for widget in self.aging_chart_frame.winfo_children():
                 widget.destroy()
             
-            # Get aging data
-            aging_data = self.analytics.get_cheque_aging_analysis()
-            
             if not aging_data:
                 ttk.Label(self.aging_chart_frame, text="Aucune donnée disponible").pack()
                 return
@@ -633,15 +742,13 @@ class EnhancedDashboardFrame(ttk.Frame):
         except Exception as e:
             print(f"Error updating aging analysis: {e}")
     
-    def update_seasonal_trends(self):
+    def update_seasonal_trends(self, seasonal_data):
         """Update seasonal trends chart"""
         try:
             # Clear previous chart
             for widget in self.seasonal_chart_frame.winfo_children():
                 widget.destroy()
             
-            # Get seasonal data
-            seasonal_data = self.analytics.get_seasonal_trends()
             monthly_trends = seasonal_data.get('monthly_trends', [])
             
             if not monthly_trends:
@@ -673,29 +780,23 @@ class EnhancedDashboardFrame(ttk.Frame):
         except Exception as e:
             print(f"Error updating seasonal trends: {e}")
     
-    def update_risk_data(self):
+    def _fetch_risk_data(self):
+        """Fetch risk profiles and the SQL-aggregated risk summary"""
+        risk_profiles = self._cached('risk_profiles', self.analytics.calculate_client_risk_profiles)
+        return risk_profiles, self.analytics.get_risk_summary()
+    
+    def update_risk_data(self, data):
         """Update risk management data"""
         try:
-            # Get risk profiles
-            risk_profiles = self.analytics.calculate_client_risk_profiles()
+            risk_profiles, summary = data
             
             # Update risk cards
             high_risk_count = len([p for p in risk_profiles if p.risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]])
             self.risk_cards['high_risk_clients'].value_label.config(text=str(high_risk_count))
             
-            # Calculate overall bounce rate
-            total_cheques = sum(p.total_cheques for p in risk_profiles)
-            total_bounced = sum(p.total_cheques * p.bounce_rate / 100 for p in risk_profiles)
-            overall_bounce_rate = (total_bounced / total_cheques * 100) if total_cheques > 0 else 0
-            self.risk_cards['bounce_rate'].value_label.config(text=f"{overall_bounce_rate:.1f}%")
-            
-            # Calculate overdue amount
-            overdue_cheques = self.db.get_cheques({
-                'status': 'en_attente',
-                'date_to': (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-            })
-            overdue_amount = sum(cheque['amount'] for cheque in overdue_cheques)
-            self.risk_cards['overdue_amount'].value_label.config(text=f"{overdue_amount:,.0f} MAD")
+            # Overall bounce rate and overdue amount (aggregated in SQL)
+            self.risk_cards['bounce_rate'].value_label.config(text=f"{summary['bounce_rate']:.1f}%")
+            self.risk_cards['overdue_amount'].value_label.config(text=f"{summary['overdue_amount']:,.0f} MAD")
             
             # Average risk score
             avg_risk_score = sum(p.risk_score for p in risk_profiles) / len(risk_profiles) if risk_profiles else 0
@@ -728,12 +829,9 @@ class EnhancedDashboardFrame(ttk.Frame):
         except Exception as e:
             print(f"Error updating risk data: {e}")
     
-    def update_performance_metrics(self):
+    def update_performance_metrics(self, metrics):
         """Update performance metrics"""
         try:
-            # Get performance data
-            metrics = self.analytics.get_performance_metrics()
-            
             # Clear previous charts
             for widget in self.performance_chart_frame.winfo_children():
                 widget.destroy()
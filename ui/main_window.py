@@ -327,8 +327,8 @@ class MainWindow:
         """Show advanced search"""
         self.notebook.select(3)  # Advanced search tab
     
-    def on_search_results(self, results):
-        """Handle search results from advanced search"""
+    def on_search_results(self, results, mode='replace'):
+        """Handle search results from advanced search (mode: 'replace' or 'append')"""
         # Switch to list view and update with results
         self.notebook.select(2)  # List tab
         # Update list with filtered results (would need to implement this method)